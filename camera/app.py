@@ -5,21 +5,47 @@ Run: python app.py
 Visit: http://localhost:3000
 """
 
-import base64
+import asyncio
+import collections
+import fcntl
+import functools
+import gzip
+import hashlib
+import html
 import json
+import os
+import queue
 import random
 import re
 import shutil
+import struct
 import subprocess
+import tempfile
 import threading
 import time
 from pathlib import Path
 
 import cv2
 import numpy as np
+from anyio import to_thread
 from fasthtml.common import *
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
 from starlette.responses import StreamingResponse, FileResponse, Response
 
+from autofocus import (CELL_AREA_LUT, V4L2_CIDS, VIDIOC_S_CTRL, blue_mask, gol_evolve_packed,
+                       laplacian_var, pack_grid, parabolic_peak, unpack_grid)
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to OpenCV
+    njit = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TJ = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG or libturbojpeg missing; use cv2.imencode
+    _TJ = None
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -34,6 +60,7 @@ SNAP_DIR = BASE_DIR / "snapshots"
 SNAP_LATEST = BASE_DIR / "snapshot.jpg"
 LOG_DIR = BASE_DIR / "logs"
 PHOTOS_DIR = BASE_DIR / "photos"
+MODEL_PATH = BASE_DIR / "autofocus_model.safetensors"
 
 SNAP_DIR.mkdir(exist_ok=True)
 LOG_DIR.mkdir(exist_ok=True)
@@ -103,10 +130,50 @@ PRESETS = {
 # CameraManager
 # ---------------------------------------------------------------------------
 
+def _decode_frame(buf: np.ndarray, scale: float = 1.0) -> np.ndarray | None:
+    """BGR image from a capture buffer, optionally downscaled. None if corrupt.
+
+    The camera is read with CONVERT_RGB off, so buffers are the raw MJPEG
+    bytes (1xN uint8). Halving uses libjpeg's DCT-domain scaling, which
+    never materialises the full-size image. A 3-D buffer means the backend
+    decoded anyway and is used as is.
+    """
+    if buf.ndim == 3:
+        frame = buf
+    elif scale == 0.5:
+        return cv2.imdecode(buf, cv2.IMREAD_REDUCED_COLOR_2)
+    else:
+        frame = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+    if frame is not None and scale < 1.0:
+        w = int(frame.shape[1] * scale)
+        h = int(frame.shape[0] * scale)
+        frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
+    return frame
+
+
+def _encode_jpeg(frame: np.ndarray, quality: int) -> bytes:
+    if _TJ is not None:
+        return _TJ.encode(frame, quality=quality, pixel_format=TJPF_BGR,
+                          jpeg_subsample=TJSAMP_420)
+    _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes()
+
+
 class CameraManager:
+    """Owns the capture. One producer thread reads every frame into a
+    latest-frame slot; streams, snapshots and autofocus all read the slot,
+    so they never contend on cap.read() or flush V4L2 buffers themselves.
+    """
+
     def __init__(self):
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # guards self.cap (producer reads vs close)
         self.cap = None
+        self.ctrl_fd = None  # separate fd for control ioctls; V4L2 allows several opens
+        self._frame_cv = threading.Condition()
+        self._latest = None  # newest raw capture buffer; replaced, never mutated
+        self._seq = 0        # frames published so far
+        self._running = False
+        self._producer_thread = None
 
     def open(self):
         self.cap = cv2.VideoCapture(CAM_DEV, cv2.CAP_V4L2)
@@ -115,41 +182,91 @@ class CameraManager:
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
         self.cap.set(cv2.CAP_PROP_FPS, CAM_FPS)
+        self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)  # hand back MJPEG bytes; decode on demand
         if not self.cap.isOpened():
             raise RuntimeError(f"Cannot open camera {CAM_DEV}")
+        self.ctrl_fd = os.open(CAM_DEV, os.O_RDWR | os.O_NONBLOCK)
+        self._running = True
+        self._producer_thread = threading.Thread(target=self._producer, daemon=True)
+        self._producer_thread.start()
         print(f"Camera opened: {CAM_DEV} {CAM_W}x{CAM_H}@{CAM_FPS}fps")
 
     def close(self):
+        self._running = False
+        if self._producer_thread:
+            self._producer_thread.join(timeout=2)
+            self._producer_thread = None
         if self.cap:
             self.cap.release()
             self.cap = None
+        if self.ctrl_fd is not None:
+            os.close(self.ctrl_fd)
+            self.ctrl_fd = None
+
+    def _producer(self):
+        while self._running:
+            with self.lock:
+                ok, buf = self.cap.read() if self.cap else (False, None)
+            if not ok:
+                time.sleep(0.1)
+                continue
+            with self._frame_cv:
+                self._latest = buf
+                self._seq += 1
+                self._frame_cv.notify_all()
+
+    def read_raw(self, fresh: int = 0, timeout: float = 5) -> np.ndarray | None:
+        """Latest frame, undecoded (see _decode_frame); None on timeout.
+
+        fresh=k waits for k more frames to be published first. The first of
+        those may have been exposing before the call, so fresh=2 guarantees
+        an exposure that started afterwards (e.g. after a focus move).
+        """
+        with self._frame_cv:
+            target = self._seq + fresh
+            if not self._frame_cv.wait_for(
+                    lambda: self._latest is not None and self._seq >= target, timeout):
+                return None  # producer stalled (camera read hung)
+            return self._latest
+
+    def read_jpeg_raw(self) -> bytes | None:
+        """The camera's own full-size JPEG, with no decode/re-encode round trip."""
+        buf = self.read_raw()
+        if buf is None:
+            return None
+        if buf.ndim == 3:
+            return _encode_jpeg(buf, 85)
+        return buf.tobytes()
 
     def read_jpeg(self, quality: int = 85, scale: float = 1.0) -> bytes | None:
-        if not self.lock.acquire(timeout=5):
-            return None  # lock held too long (camera read hung), skip frame
-        try:
-            if not self.cap:
-                return None
-            ok, frame = self.cap.read()
-            if not ok:
-                return None
-            if scale < 1.0:
-                w = int(frame.shape[1] * scale)
-                h = int(frame.shape[0] * scale)
-                frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
-            _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-            return buf.tobytes()
-        finally:
-            self.lock.release()
+        buf = self.read_raw()
+        if buf is None:
+            return None
+        frame = _decode_frame(buf, scale)
+        if frame is None:
+            return None
+        return _encode_jpeg(frame, quality)
 
     def set_ctrl(self, name: str, value: int):
+        """Set a V4L2 control: one VIDIOC_S_CTRL ioctl, or v4l2-ctl for unmapped names.
+
+        Like v4l2-ctl before it, a rejected value (out of range, inactive
+        control) is ignored.
+        """
+        cid = V4L2_CIDS.get(name)
+        if cid is not None and self.ctrl_fd is not None:
+            try:
+                fcntl.ioctl(self.ctrl_fd, VIDIOC_S_CTRL, struct.pack("Ii", cid, value))
+            except OSError:
+                pass
+            return
         subprocess.run(
             ["v4l2-ctl", "-d", CAM_DEV, "--set-ctrl", f"{name}={value}"],
             capture_output=True,
         )
 
     def snapshot(self) -> Path | None:
-        data = self.read_jpeg()
+        data = self.read_jpeg_raw()
         if data is None:
             return None
         ts = int(time.time())
@@ -163,9 +280,15 @@ cam = CameraManager()
 
 # ---------------------------------------------------------------------------
 # Autofocus live state (shared between background thread and status endpoint)
+#
+# Single producer (the autofocus thread) / readers (SSE feeds): log lines
+# go through deque.append and readers take tuple(_af_log) snapshots, both
+# atomic under the GIL, so no lock is needed. Scalars are plain rebinds.
 # ---------------------------------------------------------------------------
 
-_af_log: list[tuple[str, str]] = []   # (text, css_class)
+_af_log: collections.deque[tuple[int, str, str]] = collections.deque(maxlen=500)  # (seq, text, css_class)
+_af_log_seq = 0                        # next log seq; monotonic across runs so SSE resumes never rewind
+_af_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()  # one per open SSE feed
 _af_running = False
 _af_lock = threading.Lock()
 _af_final_focus: int | None = None
@@ -176,11 +299,18 @@ _af_offset = 0                         # focus offset applied after sweep (compe
 _af_batch_count = 1                    # how many randomize+autofocus runs to do in sequence
 _af_fft_sigma = 1.0                    # FFT angular prominence threshold (in std devs)
 _af_tag = ""                           # user tag for labeling runs
+
+def _af_notify():
+    """Wake every SSE feed; safe to call from the autofocus thread."""
+    for loop, event in tuple(_af_waiters):
+        loop.call_soon_threadsafe(event.set)
 _af_oled_target_pct = 25               # target OLED width as % of frame width
 _af_final_zoom = 150                   # actual zoom used (for slider sync on completion)
 _NORM_SIZE = (64, 32)                  # fixed crop size (w, h) for scale invariance
 _LAPLACIAN_DIVISOR = 25000.0           # tuned for 64x32 CLAHE-normalized OLED crop (bumped to avoid saturation at 1.0)
 _EDGE_MARGIN_PX = 2                    # bbox within this of frame edge = clipped
+_DETECT_SCALE = 4                      # OLED HSV detection runs at 1/4 resolution
+_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # mask dilation
 _CROP_COARSE = 80                      # progressive crop sizes per sweep phase
 _CROP_FINE = 100
 _CROP_MICRO = 120
@@ -195,8 +325,16 @@ app, rt = fast_app(
     pico=False,
     hdrs=(
         Script(src="https://unpkg.com/htmx.org@2.0.4"),
+        Script(src="https://unpkg.com/htmx-ext-sse@2.2.2/sse.js"),
     ),
 )
+# Compress the dynamic HTML pages. /docs ships pre-gzipped bytes (passed through
+# untouched), and the MJPEG stream is excluded: JPEG doesn't compress, and
+# deflate would only add CPU and latency to every frame. Model weights are
+# excluded too, so /model keeps its sendfile path.
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6,
+                   exclude_content_types=(*DEFAULT_EXCLUDED_CONTENT_TYPES, "multipart/*",
+                                          "application/octet-stream"))
 
 # ---------------------------------------------------------------------------
 # CSS
@@ -339,7 +477,7 @@ def slider(label, name, lo, hi, step, val):
         Input(
             type="range", name="value", id=name,
             min=str(lo), max=str(hi), step=str(step), value=str(val),
-            hx_post=f"/ctrl/{name}", hx_trigger="change", hx_swap="none",
+            hx_post=f"/ctrl/{name}", hx_trigger="change delay:100ms", hx_swap="none",
             oninput=f"document.getElementById('{name}_v').textContent=this.value",
         ),
         Span(str(val), id=f"{name}_v", cls="val"),
@@ -354,6 +492,13 @@ def ctrl_group(title, ctrls):
     )
 
 
+def kv_table(headers, *rows):
+    """Header row plus one Tr per row; cells that are already Td pass through."""
+    def cell(c):
+        return c if getattr(c, "tag", None) == "td" else Td(c)
+    return Table(Tr(*[Th(h) for h in headers]), *[Tr(*[cell(c) for c in r]) for r in rows])
+
+
 def _drawer_toggle(label, drawer_id):
     """Reusable toggle button for a collapsible drawer."""
     return Button(
@@ -439,6 +584,18 @@ def actions_drawer():
         ),
     )
 
+# Fragments that never change, rendered to HTML once at import. Style stays an
+# FT so FastHTML still hoists it into <head>; it just isn't rebuilt per request.
+_STYLE = Style(CSS)
+_NAV_HTML = {page: NotStr(to_xml(nav_bar(page))) for page in ("camera", "photos", "docs")}
+_ACTIONS_HTML = NotStr(to_xml(actions_drawer()))
+# These sliders always render at their configured defaults
+_CTRL_GROUPS_HTML = {
+    title: NotStr(to_xml(ctrl_group(title, ctrls)))
+    for title, ctrls in [("Position", POSITION_CTRLS), ("Focus", FOCUS_CTRLS),
+                         ("Image", IMAGE_CTRLS), ("Exposure", EXPOSURE_CTRLS)]
+}
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -452,9 +609,9 @@ def index():
     oled_target = _af_oled_target_pct
     return (
         Title("ESP Camera"),
-        Style(CSS),
+        _STYLE,
         H1("ESP Camera Calibration"),
-        nav_bar("camera"),
+        _NAV_HTML["camera"],
         Div(
             main_buttons(),
             Div(
@@ -462,7 +619,7 @@ def index():
                 Div(id="af-progress", cls="af-progress"),
                 cls="stream-panel",
             ),
-            actions_drawer(),
+            _ACTIONS_HTML,
             Div(
                 _drawer_toggle("Output", "output-drawer"),
                 Div(
@@ -474,8 +631,8 @@ def index():
                 _drawer_toggle("Controls", "drawer"),
                 Div(
                     Div(
-                        ctrl_group("Position", POSITION_CTRLS),
-                        ctrl_group("Focus", FOCUS_CTRLS),
+                        _CTRL_GROUPS_HTML["Position"],
+                        _CTRL_GROUPS_HTML["Focus"],
                         ctrl_group("Autofocus", [
                             ("Settle Time", "af_settle", 100, 1000, 50, settle_ms),
                             ("Focus Offset", "af_offset", -20, 20, 1, offset),
@@ -483,8 +640,8 @@ def index():
                             ("FFT σ (×10)", "af_fft_sigma", 5, 30, 1, fft_sigma_10x),
                             ("OLED Target %", "af_oled_target", 10, 50, 5, oled_target),
                         ]),
-                        ctrl_group("Image", IMAGE_CTRLS),
-                        ctrl_group("Exposure", EXPOSURE_CTRLS),
+                        _CTRL_GROUPS_HTML["Image"],
+                        _CTRL_GROUPS_HTML["Exposure"],
                         cls="drawer-grid",
                     ),
                     id="drawer", cls="drawer",
@@ -495,19 +652,25 @@ def index():
     )
 
 
+_MJPEG_PART_HEAD = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+_MJPEG_PART_TAIL = b"\r\n"
+
+
 @rt("/stream")
 async def stream():
-    def generate():
+    # Async generator: only the capture+encode borrows a worker thread; the
+    # pacing sleep is an event-loop timer instead of a parked thread per viewer.
+    async def generate():
         while True:
-            frame = cam.read_jpeg(quality=STREAM_QUALITY, scale=0.5)
+            frame = await to_thread.run_sync(cam.read_jpeg, STREAM_QUALITY, 0.5)
             if frame is None:
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
                 continue
-            yield (
-                b"--frame\r\n"
-                b"Content-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
-            )
-            time.sleep(1.0 / STREAM_FPS)
+            # Separate chunks: no per-frame concatenated copy of the JPEG
+            yield _MJPEG_PART_HEAD
+            yield frame
+            yield _MJPEG_PART_TAIL
+            await asyncio.sleep(1.0 / STREAM_FPS)
 
     return StreamingResponse(
         generate(),
@@ -570,16 +733,7 @@ async def preset(key: str):
         return "Unknown preset"
     for name, value in p["ctrls"].items():
         cam.set_ctrl(name, value)
-    # Return JS to update slider positions
-    js_parts = []
-    for name, value in p["ctrls"].items():
-        js_parts.append(
-            f"var el=document.getElementById('{name}');"
-            f"if(el){{el.value={value};"
-            f"var v=document.getElementById('{name}_v');if(v)v.textContent='{value}';}}"
-        )
-    js = "".join(js_parts)
-    return f"Applied: {p['label']}<script>{js}</script>"
+    return _PRESET_REPLIES[key]
 
 
 # ---------------------------------------------------------------------------
@@ -609,25 +763,71 @@ def _slider_js(values: dict[str, int]) -> str:
         )
     return "".join(parts)
 
+# Settings autofocus restores before sweeping (zoom and focus are chosen per run)
+_AF_RESTORE = {
+    "pan_absolute": 0, "tilt_absolute": 0,
+    "focus_automatic_continuous": 0, "sharpness": 180,
+    "brightness": 128, "contrast": 128, "saturation": 128,
+    "gain": 0, "backlight_compensation": 0,
+    "auto_exposure": 1, "exposure_time_absolute": 250,
+    "white_balance_automatic": 0, "white_balance_temperature": 4000,
+}
+_AF_RESTORE_JS = _slider_js(_AF_RESTORE)
+
+# Presets are constant, so each one's reply (label + slider sync JS) is built once
+_PRESET_REPLIES = {
+    key: f"Applied: {p['label']}<script>{_slider_js(p['ctrls'])}</script>"
+    for key, p in PRESETS.items()
+}
+
+# Photo/metadata writes are queued as (path, payload, imwrite params) and
+# drained by writer threads so encoding never stalls the autofocus sweep.
+# Payload is an image array (encoded via cv2.imwrite) or raw bytes.
+# OpenCV releases the GIL while encoding, so post/oled/fft encode in parallel.
+_IO_QUEUE: queue.Queue = queue.Queue()
+_IO_WORKERS = 3
+
+def _io_worker():
+    while True:
+        path, payload, params = _IO_QUEUE.get()
+        try:
+            if isinstance(payload, bytes):
+                path.write_bytes(payload)
+            else:
+                cv2.imwrite(str(path), payload, params)
+        except Exception as e:
+            print(f"Write failed for {path.name}: {e}")
+        finally:
+            _IO_QUEUE.task_done()
+
+for _ in range(_IO_WORKERS):
+    threading.Thread(target=_io_worker, daemon=True).start()
+
 def _save_af_photo(frame: np.ndarray, ts: int, suffix: str, fmt: str = "jpg") -> Path:
+    """Queue frame for writing; the queue takes ownership of it.
+
+    Views (e.g. a crop of a frame the caller keeps using) are copied first,
+    so no queued payload aliases caller memory and nobody has to wait for
+    the writers to drain.
+    """
     path = PHOTOS_DIR / f"{ts}_{suffix}.{fmt}"
-    if fmt == "png":
-        cv2.imwrite(str(path), frame)
-    else:
-        cv2.imwrite(str(path), frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    params = [] if fmt == "png" else [cv2.IMWRITE_JPEG_QUALITY, 90]
+    if frame.base is not None:
+        frame = frame.copy()
+    _IO_QUEUE.put((path, frame, params))
     return path
 
-def _capture_frame() -> np.ndarray:
-    """Capture a fresh frame from the shared camera (discards 2 buffered frames)."""
-    if not cam.lock.acquire(timeout=10):
-        raise RuntimeError("Camera lock timeout — read may be hung")
-    try:
-        cam.cap.read()
-        cam.cap.read()
-        ok, frame = cam.cap.read()
-    finally:
-        cam.lock.release()
-    if not ok:
+def _capture_frame(fresh: int = 2) -> np.ndarray:
+    """Decode a frame whose exposure started after this call (e.g. after a focus move).
+
+    fresh=1 is enough when the previous frame was already post-move: it
+    just guarantees a frame not seen before.
+    """
+    buf = cam.read_raw(fresh=fresh, timeout=10)
+    if buf is None:
+        raise RuntimeError("Camera frame timeout — read may be hung")
+    frame = _decode_frame(buf)
+    if frame is None:
         raise RuntimeError("Capture failed")
     return frame
 
@@ -636,61 +836,62 @@ def _score_position(bbox, n=3) -> float:
 
     Averaging pixel data before scoring cancels out temporal artifacts
     (OLED refresh flicker, sensor noise) that can corrupt individual frames.
+    No sleep between frames: the first waits for an exposure that started
+    after the call, and each later one only for the next new frame.
     """
-    acc = None
-    for _ in range(n):
-        frame = _capture_frame()
-        crop = _normalize_crop(frame, bbox)
-        acc = crop if acc is None else acc + crop
-        time.sleep(0.05)
-    avg_crop = acc / n
-    lap = cv2.Laplacian((avg_crop * 255).astype(np.uint8), cv2.CV_64F)
-    return min(float(lap.var()) / _LAPLACIAN_DIVISOR, 1.0)
+    acc = np.zeros(_NORM_SIZE[::-1], dtype=np.uint16)  # n * 255 fits easily
+    for i in range(n):
+        acc += _normalize_crop(_capture_frame(fresh=2 if i == 0 else 1), bbox)
+    avg_crop = (acc / n).astype(np.uint8)
+    return min(laplacian_var(avg_crop) / _LAPLACIAN_DIVISOR, 1.0)
+
+# Without numba, full-frame masking goes through OpenCV's T-API (UMat) so
+# cvtColor/inRange/dilate run on an OpenCL device when one is present.
+# Crops and the 1/4-scale detection frame are too small to pay for the upload.
+_USE_UMAT = njit is None and cv2.ocl.haveOpenCL()
 
 def _find_oled_rect(frame: np.ndarray):
-    """Detect OLED via blue HSV threshold. Returns (x,y,w,h) or None."""
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    mask = cv2.inRange(hsv, (90, 50, 30), (130, 255, 255))
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
-    mask = cv2.dilate(mask, kernel, iterations=2)
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not contours:
+    """Detect OLED via blue HSV threshold. Returns (x,y,w,h) or None.
+
+    Runs on a 1/_DETECT_SCALE frame (the blob only needs locating, not
+    scoring); the bbox is scaled back to full-frame coordinates.
+    """
+    s = _DETECT_SCALE
+    fh, fw = frame.shape[:2]
+    small = cv2.resize(frame, (fw // s, fh // s), interpolation=cv2.INTER_AREA)
+    mask = blue_mask(small)
+    mask = cv2.dilate(mask, _MORPH_KERNEL, iterations=2)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
-    c = max(contours, key=cv2.contourArea)
-    area = cv2.contourArea(c)
-    if area < 500:
+    i = 1 + int(stats[1:, cv2.CC_STAT_AREA].argmax())  # label 0 is background
+    x, y, w, h, area = map(int, stats[i])
+    if area < 500 / (s * s):
         return None
-    x, y, w, h = cv2.boundingRect(c)
     # Reject if bbox covers >50% of frame (likely false positive)
-    frame_area = frame.shape[0] * frame.shape[1]
+    frame_area = small.shape[0] * small.shape[1]
     if (w * h) > frame_area * 0.5:
         return None
     if not (1.3 < w / max(h, 1) < 3.0):
         return None
-    return (x, y, w, h)
+    return (x * s, y * s, w * s, h * s)
 
 def _find_focus_center(frame: np.ndarray) -> tuple[int, int]:
     """Find center of nearest bright cluster for focus targeting. Returns (cx, cy)."""
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    mask = cv2.inRange(hsv, (90, 50, 30), (130, 255, 255))
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-    mask = cv2.dilate(mask, kernel, iterations=1)
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    mask = blue_mask(cv2.UMat(frame) if _USE_UMAT else frame)
+    mask = cv2.dilate(mask, _MORPH_KERNEL, iterations=1)
+    if _USE_UMAT:
+        mask = mask.get()  # connected components are CPU-only
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
     fh, fw = frame.shape[:2]
     fcx, fcy = fw // 2, fh // 2
-    # Filter contours > 50px area, pick closest to frame center
-    candidates = []
-    for c in contours:
-        if cv2.contourArea(c) < 50:
-            continue
-        x, y, w, h = cv2.boundingRect(c)
-        ccx, ccy = x + w // 2, y + h // 2
-        dist = (ccx - fcx) ** 2 + (ccy - fcy) ** 2
-        candidates.append((dist, ccx, ccy))
-    if candidates:
-        candidates.sort()
-        _, cx, cy = candidates[0]
-        return (cx, cy)
+    # Filter blobs >= 50px area, pick the bbox centre closest to frame center
+    stats = stats[1:][stats[1:, cv2.CC_STAT_AREA] >= 50]
+    if len(stats):
+        ccx = stats[:, cv2.CC_STAT_LEFT] + stats[:, cv2.CC_STAT_WIDTH] // 2
+        ccy = stats[:, cv2.CC_STAT_TOP] + stats[:, cv2.CC_STAT_HEIGHT] // 2
+        i = int(((ccx - fcx) ** 2 + (ccy - fcy) ** 2).argmin())
+        return (int(ccx[i]), int(ccy[i]))
     # Fallback: frame center
     return (fcx, fcy)
 
@@ -709,13 +910,12 @@ def _center_crop_rect(frame: np.ndarray):
     return (w // 2 - cw // 2, h // 2 - ch // 2, cw, ch)
 
 def _normalize_crop(frame: np.ndarray, bbox) -> np.ndarray:
-    """Extract bbox, resize to fixed size, grayscale, CLAHE normalize."""
+    """Extract bbox, resize to fixed size, grayscale, CLAHE normalize (uint8)."""
     x, y, w, h = bbox
     gray = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
     gray = cv2.resize(gray, _NORM_SIZE, interpolation=cv2.INTER_AREA)
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-    gray = clahe.apply(gray)
-    return gray.astype(np.float32) / 255.0
+    return clahe.apply(gray)
 
 def _check_bbox_clipping(frame: np.ndarray, bbox) -> bool:
     """Return True if bbox is within _EDGE_MARGIN_PX of any frame edge."""
@@ -874,9 +1074,7 @@ def _deskew_frame(frame: np.ndarray, angle_deg: float) -> np.ndarray:
 
 def _laplacian_score(frame: np.ndarray, bbox) -> float:
     """Laplacian variance sharpness score, normalized to [0, 1]."""
-    crop = _normalize_crop(frame, bbox)
-    lap = cv2.Laplacian((crop * 255).astype(np.uint8), cv2.CV_64F)
-    return min(float(lap.var()) / _LAPLACIAN_DIVISOR, 1.0)
+    return min(laplacian_var(_normalize_crop(frame, bbox)) / _LAPLACIAN_DIVISOR, 1.0)
 
 _STAGE_NAMES = ["Scramble", "Detect", "Locate", "Coarse", "Fine", "Ultra", "Focus"]
 
@@ -896,29 +1094,51 @@ def _stage_html(current: int):
             nodes.append(Div(cls=line_cls))
     return Div(*nodes, cls="stage-bar")
 
+_AF_SCROLL_JS = "var p=document.getElementById('af-panel');if(p)p.scrollTop=p.scrollHeight;"
+
+def _af_log_listener(since: int):
+    """SSE listener that inserts log lines above itself as they are appended."""
+    return Div(
+        hx_ext="sse",
+        sse_connect=f"/autofocus-events?since={since}",
+        sse_swap="message",
+        sse_close="done",
+        hx_swap="beforebegin",
+    )
+
+def _af_log_since(since: int) -> tuple[list, int]:
+    """Snapshot log lines with seq >= since. Returns (divs, next since)."""
+    snap = tuple(_af_log)
+    lines = [Div(t, cls=c) for seq, t, c in snap if seq >= since]
+    return lines, snap[-1][0] + 1 if snap else max(since, 0)
+
+def _af_log_delta(since: int) -> list:
+    """Log lines from `since` onward, followed by a listener for the rest."""
+    elements, next_since = _af_log_since(since)
+    if elements:
+        elements.append(Script(_AF_SCROLL_JS))
+    elements.append(_af_log_listener(next_since))
+    return elements
+
+def _af_unlock_script():
+    """Unlock the UI and sync sliders to the restored settings + final focus."""
+    final_values = {"zoom_absolute": _af_final_zoom}
+    if _af_final_focus is not None:
+        final_values["focus_absolute"] = _af_final_focus
+    return Script("document.body.classList.remove('af-locked');"
+                  + _AF_RESTORE_JS + _slider_js(final_values))
+
 def _af_panel_current():
     """Return the appropriate af-panel for current state."""
     if _af_running:
-        lines = list(_af_log)
-        return Div(
-            *[Div(t, cls=c) for t, c in lines],
-            Script("var p=document.getElementById('af-panel');if(p)p.scrollTop=p.scrollHeight;"),
-            hx_get="/autofocus-status",
-            hx_trigger="load delay:300ms",
-            hx_swap="outerHTML",
-            id="af-panel", cls="af-panel",
-        )
-    if _af_log:
-        return Div(
-            *[Div(t, cls=c) for t, c in _af_log],
-            id="af-panel", cls="af-panel",
-        )
-    return Div(id="af-panel", cls="af-panel")
+        return Div(*_af_log_delta(0), id="af-panel", cls="af-panel")
+    lines, _ = _af_log_since(0)
+    return Div(*lines, id="af-panel", cls="af-panel")
 
 def _run_autofocus(initial_values: dict, batch: int = 1):
     """Background thread: coarse-to-fine autofocus with Laplacian scoring."""
-    global _af_running, _af_log, _af_final_focus, _af_progress, _af_stage, _af_final_zoom
-    _af_log = []
+    global _af_running, _af_final_focus, _af_progress, _af_stage, _af_final_zoom
+    _af_log.clear()
     _af_final_focus = None
     _af_progress = ""
     _af_stage = 0
@@ -926,7 +1146,10 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
     run_prefix = ""
 
     def log(msg, cls="af-info"):
-        _af_log.append((msg, cls))
+        global _af_log_seq
+        _af_log.append((_af_log_seq, msg, cls))
+        _af_log_seq += 1
+        _af_notify()
 
     def progress(text):
         global _af_progress
@@ -951,14 +1174,7 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
         _af_stage = 2  # Detect
         # Restore everything except focus — start at zoom=100 for wide view
         log("Restoring camera preset (wide view, zoom=100)...")
-        restore = {
-            "zoom_absolute": 100, "pan_absolute": 0, "tilt_absolute": 0,
-            "focus_automatic_continuous": 0, "sharpness": 180,
-            "brightness": 128, "contrast": 128, "saturation": 128,
-            "gain": 0, "backlight_compensation": 0,
-            "auto_exposure": 1, "exposure_time_absolute": 250,
-            "white_balance_automatic": 0, "white_balance_temperature": 4000,
-        }
+        restore = {"zoom_absolute": 100, **_AF_RESTORE}
         for name, val in restore.items():
             cam.set_ctrl(name, val)
         time.sleep(1.2)  # settle for zoom motor + image pipeline
@@ -1046,16 +1262,18 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
         log(f"--- Coarse sweep (3-frame avg, {_CROP_COARSE}x{_CROP_COARSE} crop) ---", "af-header")
         coarse = list(range(0, 256, 20))  # [0, 20, 40, ..., 240]
         results = []
+        best_pos, best_score = coarse[0], -1.0
         for i, pos in enumerate(coarse):
             progress(f"Coarse {i+1}/{len(coarse)}")
             cam.set_ctrl("focus_absolute", pos)
             time.sleep(_af_settle_s)
             score = _score_position(bbox, n=3)
             results.append((pos, score))
+            if score > best_score:
+                best_pos, best_score = pos, score
             bar = chr(9608) * int(score * 30)
             log(f"  focus={pos:3d}  score={score:.4f}  {bar}")
 
-        best_pos, best_score = max(results, key=lambda r: r[1])
         log(f"  * best: focus={best_pos} (score={best_score:.4f})", "af-good")
 
         # Bail check after coarse
@@ -1067,7 +1285,19 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
                 log(f"  Early bail: dominance {dominance:.2f}x (≥{_BAIL_DOMINANCE}x), skipping fine+micro", "af-warn")
                 bail_to_ultra = True
 
+        # Parabola through the coarse peak and its neighbours: a sharp vertex
+        # lands within the micro sweep's ±5, so the fine sweep can be skipped
+        skip_fine = False
         if not bail_to_ultra:
+            k = coarse.index(best_pos)
+            if 0 < k < len(coarse) - 1:
+                vertex = parabolic_peak(coarse[k - 1:k + 2], [s for _, s in results[k - 1:k + 2]])
+                if vertex is not None:
+                    best_pos = max(0, min(255, round(vertex)))
+                    skip_fine = True
+                    log(f"  Parabolic fit: peak at focus={best_pos}, skipping fine", "af-info")
+
+        if not bail_to_ultra and not skip_fine:
             # Fine sweep — ±15 around best, step 5, 5-frame avg
             _af_stage = 5  # Fine
             bbox = _make_crop_bbox(focus_cx, focus_cy, _CROP_FINE, frame.shape)
@@ -1083,10 +1313,11 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
                 time.sleep(_af_settle_s)
                 score = _score_position(bbox, n=5)
                 results.append((pos, score))
+                if score > best_score:
+                    best_pos, best_score = pos, score
                 bar = chr(9608) * int(score * 30)
                 log(f"  focus={pos:3d}  score={score:.4f}  {bar}")
 
-            best_pos, best_score = max(results, key=lambda r: r[1])
             log(f"  * best: focus={best_pos} (score={best_score:.4f})", "af-good")
 
             # Bail check after fine
@@ -1106,6 +1337,7 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
             micro_hi = min(255, best_pos + 5)
             tested = {r[0] for r in results}
             micro_positions = [p for p in range(micro_lo, micro_hi + 1, 2) if p not in tested]
+            prev_score, drops = None, 0
             for i, pos in enumerate(micro_positions):
                 progress(f"Micro {i+1}/{len(micro_positions)}")
                 cam.set_ctrl("focus_absolute", pos)
@@ -1114,8 +1346,15 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
                 results.append((pos, score))
                 bar = chr(9608) * int(score * 30)
                 log(f"  focus={pos:3d}  score={score:.4f}  {bar}")
-
-            # Pick best from micro range only (prevents overshoot from noisy coarse/fine scores)
+                # Unimodal curve: two drops in a row means the peak is behind us
+                drops = drops + 1 if prev_score is not None and score < prev_score else 0
+                prev_score = score
+                if drops >= 2 and i < len(micro_positions) - 1:
+                    log("  Score falling for 3 positions, stopping micro early", "af-dim")
+                    break
+
+            # Pick best from micro range only (prevents overshoot from noisy coarse/fine
+            # scores, and replaces an unmeasured parabola vertex with a measured position)
             micro_results = [(p, s) for p, s in results if micro_lo <= p <= micro_hi]
             best_pos, best_score = max(micro_results, key=lambda r: r[1])
             log(f"  * best: focus={best_pos} (score={best_score:.4f})", "af-good")
@@ -1225,7 +1464,7 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
             "oled_target_pct": _af_oled_target_pct,
             "locate_zoom": locate_zoom,
         }
-        (PHOTOS_DIR / f"{af_ts}_meta.json").write_text(json.dumps(meta, indent=2))
+        _IO_QUEUE.put((PHOTOS_DIR / f"{af_ts}_meta.json", json.dumps(meta, indent=2).encode(), None))
 
         log("")
         log(f"Done! Best focus = {best_pos}  (score = {final_score:.4f})", "af-best")
@@ -1238,6 +1477,7 @@ def _run_autofocus(initial_values: dict, batch: int = 1):
     finally:
         _af_stage = 0
         _af_running = False
+        _af_notify()
 
 # ---------------------------------------------------------------------------
 # Routes — camera controls
@@ -1330,38 +1570,63 @@ async def af_progress():
 
 @rt("/autofocus-status")
 async def autofocus_status():
-    lines = list(_af_log)
-    elements = [Div(t, cls=c) for t, c in lines]
+    """The af-panel: live (with an SSE listener) while running, else the final log."""
+    running = _af_running  # read before the log so a finishing run can't drop lines
+    if running:
+        return Div(*_af_log_delta(0), id="af-panel", cls="af-panel")
+    elements, _ = _af_log_since(0)
+    elements.append(_af_unlock_script())
+    return Div(*elements, id="af-panel", cls="af-panel")
 
-    if _af_running:
-        return Div(
-            *elements,
-            Script("var p=document.getElementById('af-panel');if(p)p.scrollTop=p.scrollHeight;"),
-            hx_get="/autofocus-status",
-            hx_trigger="load delay:300ms",
-            hx_swap="outerHTML",
-            id="af-panel", cls="af-panel",
-        )
 
-    # Done — unlock UI + sync sliders for all restored settings + final focus
-    final_values = {
-        "zoom_absolute": _af_final_zoom, "pan_absolute": 0, "tilt_absolute": 0,
-        "focus_automatic_continuous": 0, "sharpness": 180,
-        "brightness": 128, "contrast": 128, "saturation": 128,
-        "gain": 0, "backlight_compensation": 0,
-        "auto_exposure": 1, "exposure_time_absolute": 250,
-        "white_balance_automatic": 0, "white_balance_temperature": 4000,
-    }
-    if _af_final_focus is not None:
-        final_values["focus_absolute"] = _af_final_focus
-    unlock_js = "document.body.classList.remove('af-locked');" + _slider_js(final_values)
-    elements.append(Script(unlock_js))
-    return Div(*elements, id="af-panel", cls="af-panel")
+@rt("/autofocus-events")
+async def autofocus_events(req, since: int = 0):
+    """SSE feed of log lines from `since` on, pushed as they are appended.
+
+    The feed sleeps until log() or the end of the run wakes it through
+    _af_notify(). Ends with the unlock script and a "done" event that
+    closes the listener. Each message's id is the next seq, so an
+    EventSource reconnect resumes from Last-Event-ID rather than replaying
+    from `since`.
+    """
+    try:
+        since = int(req.headers.get("last-event-id", since))
+    except ValueError:
+        pass  # malformed header: resume from the query's `since`
+
+    async def events():
+        nonlocal since
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        _af_waiters.add(waiter)
+        try:
+            while True:
+                waiter[1].clear()  # before the snapshot, so no append is missed
+                running = _af_running  # before the log, as in autofocus_status
+                elements, next_since = _af_log_since(since)
+                if not running:
+                    elements.append(_af_unlock_script())
+                if elements:
+                    elements.append(Script(_AF_SCROLL_JS))
+                    yield f"id: {next_since}\n{sse_message(tuple(elements))}"
+                    since = next_since
+                if not running:
+                    yield "event: done\ndata:\n\n"
+                    return
+                try:
+                    # Timeout only as a backstop; the run's end also notifies
+                    await asyncio.wait_for(waiter[1].wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            _af_waiters.discard(waiter)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 
 @rt("/snapshot")
 async def snapshot():
-    path = cam.snapshot()
+    path = await to_thread.run_sync(cam.snapshot)
     if path:
         return f"Saved: {path.name}"
     return "Failed to capture"
@@ -1378,6 +1643,49 @@ async def snapshot_jpg():
     return Response("No snapshot yet", status_code=404)
 
 
+_IMG_STYLE = "width:100%;border:1px solid #333;border-radius:2px;"
+_CAP_STYLE = "color:#888;font-size:0.7rem;margin-top:4px;"
+_LINK_STYLE = "text-decoration:none;display:inline-block;"
+
+def _photo_cell_html(src: str, caption: str, img_style: str) -> str:
+    return (f'<div style="text-align:center;"><img src="{src}" style="{img_style}">'
+            f'<div style="{_CAP_STYLE}">{caption}</div></div>')
+
+def _photo_card_html(ts_str, date_str, tag, meta_info,
+                     pre_name, post_name, oled_name, fft_name=None) -> str:
+    """Raw HTML for one /photos run card (built as a string — 20 cards x ~15 FT nodes adds up)."""
+    drawer_id = f"card-{ts_str}"
+    tag_html = (f'<span style="color:#0ff;font-size:0.8rem;font-weight:normal;">  {html.escape(tag)}</span>'
+                if tag else "")
+    meta_html = (f'<span style="color:#0f0;font-size:0.75rem;">  {html.escape(meta_info)}</span>'
+                 if meta_info else "")
+    cells = [
+        _photo_cell_html(f"/photos/{pre_name}", "Pre (scrambled)", _IMG_STYLE),
+        _photo_cell_html(f"/photos/{post_name}", "Post (focused)", _IMG_STYLE),
+        _photo_cell_html(f"/photos/{oled_name}", "OLED crop",
+                         "width:100%;border:2px solid #0f0;border-radius:2px;image-rendering:pixelated;"),
+    ]
+    if fft_name:
+        cells.append(_photo_cell_html(f"/photos/{fft_name}", "FFT spectrum",
+                                      "width:100%;border:2px solid #0a0;border-radius:2px;image-rendering:pixelated;"))
+    cols = " ".join(["1fr"] * len(cells))
+    toggle_js = (f"var d=document.getElementById('{drawer_id}');"
+                 f"d.classList.toggle('open');"
+                 f"this.textContent=d.classList.contains('open')?'\\u25be':'\\u25b8';")
+    return (
+        f'<div style="background:#0a0a0a;border:1px solid #333;border-radius:4px;padding:12px 16px;margin-bottom:16px;">'
+        f'<div style="color:#0a0;font-size:0.85rem;font-weight:bold;">#{ts_str}{tag_html}</div>'
+        f'<div style="margin-bottom:8px;"><span style="color:#666;font-size:0.75rem;">{date_str}</span>{meta_html}</div>'
+        f'<div style="display:grid;grid-template-columns:{cols};gap:10px;">{"".join(cells)}</div>'
+        f'<button class="btn" style="font-size:0.75rem;padding:3px 10px;margin-top:8px;" onclick="{toggle_js}">\u25b8</button>'
+        f'<div id="{drawer_id}" class="drawer"><div class="btn-row">'
+        f'<a href="/photos/{post_name}" target="_blank" class="btn" style="{_LINK_STYLE}">Wide View</a>'
+        f'<a href="/photos/{oled_name}" target="_blank" class="btn" style="{_LINK_STYLE}border-color:#0f0;">OLED</a>'
+        f'<a href="/photos/{post_name}" download="{post_name}" class="btn" style="{_LINK_STYLE}">Save</a>'
+        f'</div></div></div>'
+    )
+
+
 @rt("/photos")
 def photos_page():
     # Find all pre-images, sorted newest-first, limit 20
@@ -1385,9 +1693,9 @@ def photos_page():
     if not pre_files:
         return (
             Title("Photos — Autofocus Runs"),
-            Style(CSS),
+            _STYLE,
             H1("Photos // Autofocus Runs"),
-            nav_bar("photos"),
+            _NAV_HTML["photos"],
             Div(
                 P("No runs yet — go to Camera and click ",
                   Strong("Randomize + Autofocus"), " to capture your first set.",
@@ -1420,67 +1728,14 @@ def photos_page():
             f_score = meta.get("final", {}).get("score", "?")
             meta_info = f"focus={f_val}  score={f_score}"
             tag = meta.get("tag") or ""
-        drawer_id = f"card-{ts_str}"
-        cards.append(
-            Div(
-                Div(
-                    f"#{ts_str}",
-                    Span(f"  {tag}", style="color:#0ff;font-size:0.8rem;font-weight:normal;") if tag else "",
-                    style="color:#0a0;font-size:0.85rem;font-weight:bold;",
-                ),
-                Div(
-                    Span(date_str, style="color:#666;font-size:0.75rem;"),
-                    Span(f"  {meta_info}", style="color:#0f0;font-size:0.75rem;") if meta_info else "",
-                    style="margin-bottom:8px;",
-                ),
-                Div(
-                    Div(
-                        Img(src=f"/photos/{pre_name}", style="width:100%;border:1px solid #333;border-radius:2px;"),
-                        Div("Pre (scrambled)", style="color:#888;font-size:0.7rem;margin-top:4px;"),
-                        style="text-align:center;",
-                    ),
-                    Div(
-                        Img(src=f"/photos/{post_name}", style="width:100%;border:1px solid #333;border-radius:2px;"),
-                        Div("Post (focused)", style="color:#888;font-size:0.7rem;margin-top:4px;"),
-                        style="text-align:center;",
-                    ),
-                    Div(
-                        Img(src=f"/photos/{oled_name}", style="width:100%;border:2px solid #0f0;border-radius:2px;image-rendering:pixelated;"),
-                        Div("OLED crop", style="color:#888;font-size:0.7rem;margin-top:4px;"),
-                        style="text-align:center;",
-                    ),
-                    *([Div(
-                        Img(src=f"/photos/{fft_name}", style="width:100%;border:2px solid #0a0;border-radius:2px;image-rendering:pixelated;"),
-                        Div("FFT spectrum", style="color:#888;font-size:0.7rem;margin-top:4px;"),
-                        style="text-align:center;",
-                    )] if has_fft else []),
-                    style=f"display:grid;grid-template-columns:{'1fr 1fr 1fr 1fr' if has_fft else '1fr 1fr 1fr'};gap:10px;",
-                ),
-                Button("\u25b8", cls="btn",
-                       style="font-size:0.75rem;padding:3px 10px;margin-top:8px;",
-                       onclick=f"var d=document.getElementById('{drawer_id}');"
-                               f"d.classList.toggle('open');"
-                               f"this.textContent=d.classList.contains('open')?'\\u25be':'\\u25b8';"),
-                Div(
-                    Div(
-                        A("Wide View", href=f"/photos/{post_name}", target="_blank", cls="btn",
-                          style="text-decoration:none;display:inline-block;"),
-                        A("OLED", href=f"/photos/{oled_name}", target="_blank", cls="btn",
-                          style="text-decoration:none;display:inline-block;border-color:#0f0;"),
-                        A("Save", href=f"/photos/{post_name}", download=post_name, cls="btn",
-                          style="text-decoration:none;display:inline-block;"),
-                        cls="btn-row",
-                    ),
-                    id=drawer_id, cls="drawer",
-                ),
-                style="background:#0a0a0a;border:1px solid #333;border-radius:4px;padding:12px 16px;margin-bottom:16px;",
-            )
-        )
+        cards.append(_photo_card_html(ts_str, date_str, tag, meta_info,
+                                      pre_name, post_name, oled_name,
+                                      fft_name if has_fft else None))
     return (
         Title("Photos — Autofocus Runs"),
-        Style(CSS),
+        _STYLE,
         H1("Photos // Autofocus Runs"),
-        nav_bar("photos"),
+        _NAV_HTML["photos"],
         Div(
             Div(
                 Button("Archive All", hx_post="/photos/archive", hx_swap="innerHTML",
@@ -1489,7 +1744,7 @@ def photos_page():
                 Div(id="photos-status", cls="status"),
                 cls="btn-row", style="margin-bottom:16px;",
             ),
-            *cards,
+            NotStr("\n".join(cards)),
             style="max-width:1100px;margin:0 auto;",
         ),
     )
@@ -1574,9 +1829,27 @@ def _make_rotated_grid(angle_deg: float, size: int = 200, pitch: int = 6, seed:
     return bgr
 
 
-def _fft_spectrum_data_uri(img: np.ndarray, scale: int = 1,
+# Docs thumbnails are served as raw images rather than inlined base64. Keys are
+# content hashes, so a URL never changes meaning and browsers may cache forever.
+_DOCS_IMAGES: dict[str, bytes] = {}
+
+
+# Lossless WebP: pixel-identical to PNG and about half the bytes for this
+# pixel art. Encoding is a one-time cost, since the docs body is cached.
+_DOCS_IMG_PARAMS = [cv2.IMWRITE_WEBP_QUALITY, 101]  # quality > 100 selects lossless
+
+def _docs_img_src(img: np.ndarray) -> str:
+    """Encode a BGR image for /docs/img and return its URL."""
+    _, buf = cv2.imencode(".webp", img, _DOCS_IMG_PARAMS)
+    data = buf.tobytes()
+    key = hashlib.sha1(data).hexdigest()[:16]
+    _DOCS_IMAGES[key] = data
+    return f"/docs/img/{key}"
+
+
+def _fft_spectrum_img_src(img: np.ndarray, scale: int = 1,
                            show_angle: bool = False) -> str:
-    """FFT magnitude spectrum as green-on-black PNG data URI.
+    """FFT magnitude spectrum as a green-on-black image served under /docs/img.
 
     img: BGR or grayscale image.
     If show_angle=True, draws the annular band and detected angle line in cyan.
@@ -1630,66 +1903,63 @@ def _fft_spectrum_data_uri(img: np.ndarray, scale: int = 1,
     if scale > 1:
         bgr = cv2.resize(bgr, (w * scale, h * scale), interpolation=cv2.INTER_NEAREST)
 
-    _, buf = cv2.imencode(".png", bgr)
-    return f"data:image/png;base64,{base64.b64encode(buf).decode()}"
+    return _docs_img_src(bgr)
 
 
-def _bgr_to_data_uri(img: np.ndarray, scale: int = 1) -> str:
-    """Convert a BGR image to a PNG data URI."""
+def _bgr_img_src(img: np.ndarray, scale: int = 1) -> str:
+    """Serve a BGR image under /docs/img."""
     if scale > 1:
         h, w = img.shape[:2]
         img = cv2.resize(img, (w * scale, h * scale), interpolation=cv2.INTER_NEAREST)
-    _, buf = cv2.imencode(".png", img)
-    return f"data:image/png;base64,{base64.b64encode(buf).decode()}"
+    return _docs_img_src(img)
 
 
 # ---------------------------------------------------------------------------
 # Pipeline page helpers
 # ---------------------------------------------------------------------------
 
-def _gol_step(grid):
-    neighbors = np.zeros_like(grid)
-    for dy in (-1, 0, 1):
-        for dx in (-1, 0, 1):
-            if dy == 0 and dx == 0:
-                continue
-            neighbors += np.roll(np.roll(grid, dy, axis=0), dx, axis=1)
-    return ((neighbors == 3) | ((grid == 1) & (neighbors == 2))).astype(np.uint8)
-
-def _add_pixel_grid(frame: np.ndarray, cell_px: int = 4) -> np.ndarray:
-    """Upscale binary GoL frame and add 1px black grid lines between cells."""
-    h, w = frame.shape
-    big = cv2.resize(frame.astype(np.float32), (w * cell_px, h * cell_px),
-                     interpolation=cv2.INTER_NEAREST)
-    big[::cell_px, :] = 0
-    big[:, ::cell_px] = 0
-    return big
-
-def _make_sample(density, steps, sigma, seed=42):
+_SAMPLE_RNG = np.random.default_rng()
+
+@functools.lru_cache(maxsize=16)
+def _gaussian_kernel(sigma: float) -> np.ndarray:
+    """1-D Gaussian taps for a +/-3 sigma window; sepFilter2D with it == GaussianBlur."""
+    return cv2.getGaussianKernel(int(np.ceil(sigma * 3)) * 2 + 1, sigma, cv2.CV_32F)
+
+def _make_samples(densities, steps, sigmas, rngs):
+    """Generate a batch of synthetic GoL samples. Returns (images (N, 32, 64) float32, labels).
+
+    Each start grid is drawn from its own rng (None means the shared
+    _SAMPLE_RNG); the docs page passes seeded ones so its images are stable
+    across reloads. Evolution and rendering run on the whole stack at once.
+    """
+    grids = np.stack([((rng or _SAMPLE_RNG).random((64, 128)) < d)
+                      for d, rng in zip(densities, rngs)]).astype(np.uint8)
+    grids = unpack_grid(gol_evolve_packed(pack_grid(grids), np.asarray(steps)))
+    counts = grids.reshape(-1, 32, 2, 64, 2).sum(axis=(2, 4), dtype=np.uint8)
+    imgs = CELL_AREA_LUT[counts].astype(np.float32) * (1 / 255)
+    sigmas = np.asarray(sigmas, dtype=np.float64)
+    for img, sigma in zip(imgs, sigmas):
+        if sigma <= 0.3:
+            continue  # already in [0, 1] straight from the uint8 grid
+        k = _gaussian_kernel(float(sigma))
+        img[:] = cv2.sepFilter2D(img, -1, k, k)
+        np.clip(img, 0, 1, out=img)
+    return imgs, 1.0 / (1.0 + sigmas * sigmas)
+
+def _make_sample(density, steps, sigma, rng=None):
     """Generate one synthetic GoL sample. Returns (image_float32, label)."""
-    rng = np.random.default_rng(seed)
-    grid = (rng.random((64, 128)) < density).astype(np.uint8)
-    for _ in range(steps):
-        grid = _gol_step(grid)
-    grid_frame = _add_pixel_grid(grid, cell_px=4)
-    small = cv2.resize(grid_frame, (64, 32), interpolation=cv2.INTER_AREA)
-    if sigma > 0.3:
-        ksize = int(np.ceil(sigma * 3)) * 2 + 1
-        small = cv2.GaussianBlur(small, (ksize, ksize), sigma)
-    small = np.clip(small, 0, 1)
-    label = 1.0 / (1.0 + sigma * sigma)
-    return small, label
-
-def _to_data_uri(img, scale=4):
-    """Convert float32 [0,1] grayscale to blue-on-black PNG data URI."""
+    imgs, labels = _make_samples([density], [steps], [sigma], [rng])
+    return imgs[0], float(labels[0])
+
+def _to_img_src(img, scale=4):
+    """Serve float32 [0,1] grayscale as a blue-on-black image under /docs/img."""
     h, w = img.shape
-    big = cv2.resize(img, (w * scale, h * scale), interpolation=cv2.INTER_NEAREST)
-    bgr = np.zeros((*big.shape, 3), dtype=np.uint8)
-    vals = (big * 255).astype(np.uint8)
-    bgr[:, :, 0] = vals                           # blue
-    bgr[:, :, 1] = (vals * 0.35).astype(np.uint8) # subtle green
-    _, buf = cv2.imencode(".png", bgr)
-    return f"data:image/png;base64,{base64.b64encode(buf).decode()}"
+    # Colorize at native size, then nearest-upscale the 3-channel result
+    vals = cv2.convertScaleAbs(img, alpha=255.0)              # blue
+    green = (vals.astype(np.uint16) * 89 >> 8).astype(np.uint8)  # ~0.35, subtle green
+    bgr = cv2.merge((vals, green, np.zeros_like(vals)))
+    bgr = cv2.resize(bgr, (w * scale, h * scale), interpolation=cv2.INTER_NEAREST)
+    return _docs_img_src(bgr)
 
 def _loss_curve_svg():
     """Inline SVG of training loss curve."""
@@ -1701,29 +1971,28 @@ def _loss_curve_svg():
     def ty(l): return py + ph - (l / max_loss) * ph
 
     points = [(tx(s), ty(l)) for s, l in zip(steps, losses)]
-    path_d = f"M {points[0][0]:.1f},{points[0][1]:.1f}"
-    for x, y in points[1:]:
-        path_d += f" L {x:.1f},{y:.1f}"
+    path_d = " L ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+    path_d = f"M {path_d}"
 
     # Area under curve
     area_d = path_d + f" L {points[-1][0]:.1f},{py+ph} L {points[0][0]:.1f},{py+ph} Z"
 
-    grid = ""
-    for v in [0.05, 0.10]:
-        grid += f'<line x1="{px}" y1="{ty(v):.0f}" x2="{px+pw}" y2="{ty(v):.0f}" stroke="#222" stroke-dasharray="4"/>\n'
-    for s in [50, 100, 150]:
-        grid += f'<line x1="{tx(s):.0f}" y1="{py}" x2="{tx(s):.0f}" y2="{py+ph}" stroke="#1a1a1a" stroke-dasharray="4"/>\n'
+    grid = "".join(
+        [f'<line x1="{px}" y1="{ty(v):.0f}" x2="{px+pw}" y2="{ty(v):.0f}" stroke="#222" stroke-dasharray="4"/>\n'
+         for v in [0.05, 0.10]]
+        + [f'<line x1="{tx(s):.0f}" y1="{py}" x2="{tx(s):.0f}" y2="{py+ph}" stroke="#1a1a1a" stroke-dasharray="4"/>\n'
+           for s in [50, 100, 150]])
 
-    ylabels = ""
-    for v in [0, 0.05, 0.10, 0.15]:
-        ylabels += f'<text x="{px-6}" y="{ty(v):.0f}" fill="#666" font-size="10" text-anchor="end" dominant-baseline="middle">{v:.2f}</text>\n'
-    xlabels = ""
-    for s in [0, 50, 100, 150, 200]:
-        xlabels += f'<text x="{tx(s):.0f}" y="{py+ph+14}" fill="#666" font-size="10" text-anchor="middle">{s}</text>\n'
+    ylabels = "".join(
+        f'<text x="{px-6}" y="{ty(v):.0f}" fill="#666" font-size="10" text-anchor="end" dominant-baseline="middle">{v:.2f}</text>\n'
+        for v in [0, 0.05, 0.10, 0.15])
+    xlabels = "".join(
+        f'<text x="{tx(s):.0f}" y="{py+ph+14}" fill="#666" font-size="10" text-anchor="middle">{s}</text>\n'
+        for s in [0, 50, 100, 150, 200])
 
-    dots = ""
-    for x, y in points:
-        dots += f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.5" fill="#0f0" stroke="#0a0a0a" stroke-width="1"/>\n'
+    dots = "".join(
+        f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.5" fill="#0f0" stroke="#0a0a0a" stroke-width="1"/>\n'
+        for x, y in points)
 
     return (
         f'<svg viewBox="0 0 450 220" xmlns="http://www.w3.org/2000/svg">\n'
@@ -1761,7 +2030,7 @@ flowchart LR
         J --> K["4-Phase Sweep\\nCoarse→Fine→\\nMicro→Ultra"]
         K --> L["Grid Angle\\nDetection"]
         L --> M["Deskew +\\nOLED Re-detect"]
-        M --> N["Set Focus\\nv4l2-ctl"]
+        M --> N["Set Focus\\nV4L2 ioctl"]
     end
 """
 
@@ -1779,33 +2048,61 @@ flowchart TD
     style I fill:#1a2a1a,stroke:#0a0,color:#0f0
 """
 
-@rt("/docs")
-def docs_page():
-    model_path = BASE_DIR / "autofocus_model.safetensors"
-    model_exists = model_path.exists()
-    model_size = f"{model_path.stat().st_size / 1024:.1f} KB" if model_exists else "not trained"
-    model_date = time.strftime("%Y-%m-%d %H:%M", time.localtime(model_path.stat().st_mtime)) if model_exists else "—"
+_MERMAID_CONFIG = {
+    "theme": "base",
+    "themeVariables": {
+        "background": "#0a0a0a", "primaryColor": "#1a2a1a", "primaryBorderColor": "#0a0",
+        "primaryTextColor": "#ccc", "secondaryColor": "#0a1a2a", "secondaryBorderColor": "#333",
+        "secondaryTextColor": "#ccc", "tertiaryColor": "#1a1a1a", "tertiaryBorderColor": "#333",
+        "lineColor": "#0a0", "textColor": "#ccc", "fontSize": "13px",
+        "fontFamily": "'JetBrains Mono', monospace",
+    },
+}
+
+_MERMAID_JS = (
+    "import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@11/dist/mermaid.esm.min.mjs';\n"
+    f"mermaid.initialize({json.dumps({'startOnLoad': True, **_MERMAID_CONFIG})});"
+)
 
+def _mermaid_html(src: str, svg_id: str) -> str:
+    """A diagram as inline SVG, pre-rendered with mermaid-cli (mmdc) when it is
+    installed; otherwise a <pre class="mermaid"> for the browser to lay out.
+
+    mmdc scopes the SVG's styles and marker ids under svg_id (default
+    "my-svg"), so each diagram inlined on a page needs its own.
+    """
+    mmdc = shutil.which("mmdc")
+    if mmdc:
+        with tempfile.TemporaryDirectory() as tmp:
+            d = Path(tmp)
+            (d / "in.mmd").write_text(src)
+            (d / "config.json").write_text(json.dumps(_MERMAID_CONFIG))
+            try:
+                subprocess.run(
+                    [mmdc, "-i", d / "in.mmd", "-o", d / "out.svg",
+                     "-c", d / "config.json", "-b", "transparent", "--svgId", svg_id],
+                    capture_output=True, timeout=60, check=True,
+                )
+                return (d / "out.svg").read_text()
+            except (OSError, subprocess.SubprocessError):
+                pass  # headless browser missing, etc.: render client-side
+    return f'<pre class="mermaid">\n{src}\n</pre>'
+
+# Placeholders for the only per-request values on the docs page
+_MODEL_SIZE_SLOT = "{{MODEL_SIZE}}"
+_MODEL_DATE_SLOT = "{{MODEL_DATE}}"
+
+@functools.cache
+def _docs_body_html() -> str:
+    """Render the docs page body once; everything but the model size/date is static."""
     # --- Generate sample images ---
     blur_sigmas = [0.0, 0.5, 1.5, 2.5, 4.0]
-    blur_samples = []
-    for sigma in blur_sigmas:
-        img, label = _make_sample(0.25, 8, sigma, seed=77)
-        uri = _to_data_uri(img)
-        blur_samples.append((sigma, label, uri))
-
     density_configs = [
         (0.10, 3, 10),
         (0.20, 8, 20),
         (0.30, 12, 30),
         (0.40, 5, 40),
     ]
-    density_samples = []
-    for dens, steps, seed in density_configs:
-        img, label = _make_sample(dens, steps, 0.0, seed=seed)
-        uri = _to_data_uri(img)
-        density_samples.append((dens, steps, uri))
-
     # --- Test evaluation data (from validation run) ---
     eval_data = [
         (0.25, 8, 0.2, 55, 0.962, 0.961),
@@ -1815,317 +2112,400 @@ def docs_page():
         (0.20, 15, 3.5, 99, 0.075, 0.108),
         (0.40, 1, 1.8, 11, 0.236, 0.219),
     ]
-    eval_rows = []
-    for dens, steps, sigma, seed, true_v, pred_v in eval_data:
-        img, _ = _make_sample(dens, steps, sigma, seed=seed)
-        uri = _to_data_uri(img, scale=3)
-        err = abs(true_v - pred_v)
-        eval_rows.append((uri, sigma, true_v, pred_v, err))
+
+    # All three sections' samples come out of one batch: (density, steps, sigma, seed)
+    specs = ([(0.25, 8, sigma, 77) for sigma in blur_sigmas]
+             + [(dens, steps, 0.0, seed) for dens, steps, seed in density_configs]
+             + [(dens, steps, sigma, seed) for dens, steps, sigma, seed, _, _ in eval_data])
+    dens, steps, sigmas, seeds = zip(*specs)
+    imgs, labels = _make_samples(dens, steps, sigmas, [np.random.default_rng(s) for s in seeds])
+    labels = labels.tolist()
+    nb, nd = len(blur_sigmas), len(density_configs)
+
+    blur_samples = [(sigma, label, _to_img_src(img))
+                    for sigma, label, img in zip(blur_sigmas, labels[:nb], imgs[:nb])]
+    density_samples = [(dens, steps, _to_img_src(img))
+                       for (dens, steps, _), img in zip(density_configs, imgs[nb:nb + nd])]
+    eval_rows = [(_to_img_src(img, scale=3), sigma, true_v, pred_v, abs(true_v - pred_v))
+                 for (_, _, sigma, _, true_v, pred_v), img in zip(eval_data, imgs[nb + nd:])]
 
     loss_svg = _loss_curve_svg()
 
     # --- FFT demo: synthetic rotated grid at 15° ---
     fft_demo_angle = 15.0
     fft_demo_grid = _make_rotated_grid(fft_demo_angle, size=200, pitch=6, seed=42)
-    fft_demo_grid_uri = _bgr_to_data_uri(fft_demo_grid, scale=1)
+    fft_demo_grid_src = _bgr_img_src(fft_demo_grid, scale=1)
 
     # Plain FFT spectrum (no annotations)
-    fft_demo_plain_uri = _fft_spectrum_data_uri(fft_demo_grid, scale=1)
+    fft_demo_plain_src = _fft_spectrum_img_src(fft_demo_grid, scale=1)
 
     # Annotated FFT spectrum (with annular band + angle line)
-    fft_demo_annotated_uri = _fft_spectrum_data_uri(
+    fft_demo_annotated_src = _fft_spectrum_img_src(
         fft_demo_grid, scale=1, show_angle=True,
     )
 
     # Deskewed result
     fft_demo_deskewed = _deskew_frame(fft_demo_grid, fft_demo_angle)
-    fft_demo_deskewed_uri = _bgr_to_data_uri(fft_demo_deskewed, scale=1)
-
-    mermaid_js = (
-        "import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@11/dist/mermaid.esm.min.mjs';\n"
-        "mermaid.initialize({ startOnLoad: true, theme: 'base', themeVariables: {"
-        " background:'#0a0a0a', primaryColor:'#1a2a1a', primaryBorderColor:'#0a0',"
-        " primaryTextColor:'#ccc', secondaryColor:'#0a1a2a', secondaryBorderColor:'#333',"
-        " secondaryTextColor:'#ccc', tertiaryColor:'#1a1a1a', tertiaryBorderColor:'#333',"
-        " lineColor:'#0a0', textColor:'#ccc', fontSize:'13px',"
-        " fontFamily:'\\'JetBrains Mono\\', monospace'"
-        "} });"
-    )
-
-    return (
-        Title("OLED Autofocus — System Documentation"),
-        Style(CSS),
-        Script(mermaid_js, type="module"),
-        H1("OLED Autofocus // System Documentation"),
-        nav_bar("docs"),
+    fft_demo_deskewed_src = _bgr_img_src(fft_demo_deskewed, scale=1)
+
+    return to_xml(Div(
+        # ---- Intro ----
+        P("Automated focus for a Logitech BRIO camera pointing at an SSD1306 128x64 OLED "
+          "running Conway's Game of Life on an ESP32-C6. Combines Laplacian variance scoring "
+          "with a four-phase progressive sweep, early bail on dominant peaks, "
+          "and grid rotation detection for deskewed OLED re-detection."),
         Div(
-            # ---- Intro ----
-            P("Automated focus for a Logitech BRIO camera pointing at an SSD1306 128x64 OLED "
-              "running Conway's Game of Life on an ESP32-C6. Combines Laplacian variance scoring "
-              "with a four-phase progressive sweep, early bail on dominant peaks, "
-              "and grid rotation detection for deskewed OLED re-detection."),
-            Div(
-                Span("tinygrad", cls="tag"), Span("OpenCV", cls="tag"),
-                Span("v4l2-ctl", cls="tag"), Span("ESP32-C6", cls="tag"),
-                Span("SSD1306 OLED", cls="tag"), Span("Logitech BRIO", cls="tag"),
-            ),
-
-            # ---- Hardware ----
-            H2("Hardware Setup"),
-            Table(
-                Tr(Th("Component"), Th("Details")),
-                Tr(Td("Camera"), Td("Logitech BRIO 4K, /dev/video1, 1280x720 @ 15fps MJPG")),
-                Tr(Td("Focus control"), Td("Manual via v4l2-ctl: focus_absolute 0–255")),
-                Tr(Td("Target display"), Td("SSD1306 0.96\" OLED, 128x64 pixels, I2C (GPIO6 SDA, GPIO7 SCL)")),
-                Tr(Td("Microcontroller"), Td("ESP32-C6-DevKitC-1-N8, RISC-V, running Game of Life firmware")),
-                Tr(Td("Focus scene"), Td("Blue OLED pixels on black + starburst calibration card behind")),
-            ),
+            Span("tinygrad", cls="tag"), Span("OpenCV", cls="tag"),
+            Span("V4L2 ioctl", cls="tag"), Span("ESP32-C6", cls="tag"),
+            Span("SSD1306 OLED", cls="tag"), Span("Logitech BRIO", cls="tag"),
+        ),
 
-            # ---- End-to-End Flow ----
-            H2("End-to-End Flow"),
-            P("Two phases: offline CNN training on synthetic data (~35s), then live autofocus "
-              "via progressive four-phase sweep. No real camera images needed for training."),
-            Div(NotStr(f'<pre class="mermaid">\n{MERMAID_PIPELINE}\n</pre>'), cls="mermaid-wrap"),
-
-            # ---- Autofocus Algorithm ----
-            H2("Autofocus Algorithm"),
-            P("Six-stage pipeline: Scramble, Detect, Coarse, Fine, Ultra, Focus. "
-              "Each sweep phase uses a progressively larger crop around the detected focus center "
-              "for better signal discrimination."),
-
-            H3("Focus Detection"),
-            P("HSV blue threshold finds bright clusters in the camera frame. "
-              "The center point of the nearest cluster to frame center is used as the "
-              "focus target — a single (cx, cy) coordinate, not a bounding box. "
-              "Fallback: frame center."),
-
-            H3("Four-Phase Sweep"),
-            P("Each phase builds its own crop box around the focus center. "
-              "Smaller crops give more focused Laplacian signal in early phases; "
-              "larger crops provide better discrimination in later phases:"),
-            Table(
-                Tr(Th("Phase"), Th("Crop"), Th("Range"), Th("Step"), Th("Avg Frames")),
-                Tr(Td("1. Coarse"), Td("20x20"), Td("0–255"), Td("20"), Td("3")),
-                Tr(Td("2. Fine"), Td("30x30"), Td("best ± 15"), Td("5"), Td("5")),
-                Tr(Td("3. Micro"), Td("40x40"), Td("best ± 5"), Td("2"), Td("5")),
-                Tr(Td("4. Ultra"), Td("40x40"), Td("best ± 2"), Td("1"), Td("5")),
-            ),
+        # ---- Hardware ----
+        H2("Hardware Setup"),
+        kv_table(
+            ("Component", "Details"),
+            ("Camera", "Logitech BRIO 4K, /dev/video1, 1280x720 @ 15fps MJPG"),
+            ("Focus control", "Manual via V4L2 ioctl: focus_absolute 0–255"),
+            ("Target display", "SSD1306 0.96\" OLED, 128x64 pixels, I2C (GPIO6 SDA, GPIO7 SCL)"),
+            ("Microcontroller", "ESP32-C6-DevKitC-1-N8, RISC-V, running Game of Life firmware"),
+            ("Focus scene", "Blue OLED pixels on black + starburst calibration card behind"),
+        ),
 
-            H3("Early Bail"),
-            P("After coarse and fine sweeps, if the best score is ", Code("≥ 1.5x"),
-              " the second-best (with at least 3 results), the algorithm skips "
-              "intermediate phases and jumps straight to ultra. "
-              "Ultra always runs — it's only ~5 positions. This can cut sweep time significantly "
-              "when the focus peak is unambiguous."),
+        # ---- End-to-End Flow ----
+        H2("End-to-End Flow"),
+        P("Two phases: offline CNN training on synthetic data (~35s), then live autofocus "
+          "via progressive four-phase sweep. No real camera images needed for training."),
+        Div(NotStr(_mermaid_html(MERMAID_PIPELINE, "pipeline-svg")), cls="mermaid-wrap"),
+
+        # ---- Autofocus Algorithm ----
+        H2("Autofocus Algorithm"),
+        P("Six-stage pipeline: Scramble, Detect, Coarse, Fine, Ultra, Focus. "
+          "Each sweep phase uses a progressively larger crop around the detected focus center "
+          "for better signal discrimination."),
+
+        H3("Focus Detection"),
+        P("HSV blue threshold finds bright clusters in the camera frame. "
+          "The center point of the nearest cluster to frame center is used as the "
+          "focus target — a single (cx, cy) coordinate, not a bounding box. "
+          "Fallback: frame center."),
+
+        H3("Four-Phase Sweep"),
+        P("Each phase builds its own crop box around the focus center. "
+          "Smaller crops give more focused Laplacian signal in early phases; "
+          "larger crops provide better discrimination in later phases:"),
+        kv_table(
+            ("Phase", "Crop", "Range", "Step", "Avg Frames"),
+            ("1. Coarse", "20x20", "0–255", "20", "3"),
+            ("2. Fine", "30x30", "best ± 15", "5", "5"),
+            ("3. Micro", "40x40", "best ± 5", "2", "5"),
+            ("4. Ultra", "40x40", "best ± 2", "1", "5"),
+        ),
 
-            H3("Grid Rotation Detection (FFT)"),
-            P("The OLED pixel grid creates a periodic pattern that produces sharp peaks "
-              "in the 2D FFT magnitude spectrum. The angle from the DC center to the "
-              "dominant peak equals the grid rotation angle. This works at any zoom where "
-              "the grid is visible — even when individual pixels are too small for contour "
-              "detection (< 3 camera pixels wide)."),
+        H3("Early Bail"),
+        P("After coarse and fine sweeps, if the best score is ", Code("≥ 1.5x"),
+          " the second-best (with at least 3 results), the algorithm skips "
+          "intermediate phases and jumps straight to ultra. "
+          "Ultra always runs — it's only ~5 positions. This can cut sweep time significantly "
+          "when the focus peak is unambiguous."),
+
+        H3("Parabolic Refinement"),
+        P("When the coarse peak is interior, a parabola through it and its two "
+          "neighbours predicts the true peak; micro centres on that vertex and fine "
+          "is skipped. A flat or convex fit falls back to the fine sweep. Micro also "
+          "stops once the score has fallen at three consecutive positions."),
+
+        H3("Grid Rotation Detection (FFT)"),
+        P("The OLED pixel grid creates a periodic pattern that produces sharp peaks "
+          "in the 2D FFT magnitude spectrum. The angle from the DC center to the "
+          "dominant peak equals the grid rotation angle. This works at any zoom where "
+          "the grid is visible — even when individual pixels are too small for contour "
+          "detection (< 3 camera pixels wide)."),
 
+        Div(
             Div(
-                Div(
-                    Img(src=fft_demo_grid_uri),
-                    Div(f"Input grid ({fft_demo_angle:.0f}°)", cls="cap"),
-                    cls="img-cell",
-                ),
-                Div(
-                    Img(src=fft_demo_plain_uri),
-                    Div("FFT magnitude", cls="cap"),
-                    cls="img-cell",
-                ),
-                Div(
-                    Img(src=fft_demo_annotated_uri),
-                    Div(Span("Peak detection", cls="hi"), cls="cap"),
-                    cls="img-cell",
-                ),
-                Div(
-                    Img(src=fft_demo_deskewed_uri),
-                    Div("Deskewed result", cls="cap"),
-                    cls="img-cell",
-                ),
-                cls="img-grid cols-4",
+                Img(src=fft_demo_grid_src),
+                Div(f"Input grid ({fft_demo_angle:.0f}°)", cls="cap"),
+                cls="img-cell",
             ),
-
-            P("Algorithm:"),
-            Ul(
-                Li("Take a 200x200 crop around the focus center (more periods = sharper peaks)"),
-                Li("Grayscale, multiply by 2D Hanning window (reduces spectral leakage)"),
-                Li(Code("np.fft.fft2"), " → ", Code("fftshift"), " → ", Code("log1p(abs())"),
-                   " = magnitude spectrum"),
-                Li("Mask out DC region (radius < 5px from center)"),
-                Li("Find dominant peak in upper half (conjugate symmetry)"),
-                Li("Prominence check: peak must be ≥ 3× median (rejects flat/noisy spectra)"),
-                Li(Code("atan2(dy, dx)"), " → angle in degrees, rotated 90° (peak ⊥ grid), "
-                   "normalized to [-45°, 45°]"),
-            ),
-            P("Advantages over contour-based detection:"),
-            Ul(
-                Li(Strong("Zoom-invariant:"), " Works at any magnification where the grid is visible — "
-                   "no minimum pixel size required"),
-                Li(Strong("Single-peak aggregation:"), " One dominant peak instead of "
-                   "voting across dozens of noisy contour angles"),
-                Li(Strong("Sub-pixel pitch:"), " Even 2–3 camera pixels per OLED pixel "
-                   "creates a measurable FFT peak"),
+            Div(
+                Img(src=fft_demo_plain_src),
+                Div("FFT magnitude", cls="cap"),
+                cls="img-cell",
             ),
-            P("If detected (|angle| > 0.5°), the frame is deskewed via ", Code("cv2.warpAffine"),
-              " before OLED re-detection. This produces tighter, axis-aligned bounding boxes "
-              "and cleaner OLED crops."),
-
-            H3("OLED Re-detection"),
-            P("After the sweep finds best focus and applies any offset, the OLED is "
-              "re-detected on the (possibly deskewed) sharp frame using the full HSV "
-              "pipeline. The post-autofocus photo and OLED crop use this refined bbox. "
-              "If the OLED isn't found, the focus crop is used as fallback."),
-
-            # ---- Scoring ----
-            H2("Sharpness Scoring"),
-            H3("OLED Detection (HSV)"),
-            P("Classical CV pipeline finds the blue OLED region in the camera frame:"),
-            Table(
-                Tr(Th("Step"), Th("Details")),
-                Tr(Td("Color space"), Td("BGR → HSV")),
-                Tr(Td("Threshold"), Td("H: 90–130, S: 50–255, V: 30–255 (blue glow)")),
-                Tr(Td("Morphology"), Td("Dilate with 7x7 rect kernel, 2 iterations")),
-                Tr(Td("Contour"), Td("Largest contour, area > 500px, aspect ratio 1.3–3.0")),
-                Tr(Td("Fallback"), Td("Focus crop bbox if OLED not detected")),
+            Div(
+                Img(src=fft_demo_annotated_src),
+                Div(Span("Peak detection", cls="hi"), cls="cap"),
+                cls="img-cell",
             ),
-            H3("Laplacian Score"),
-            P("Crops are extracted, resized to 64x32, CLAHE-normalized, then scored "
-              "via Laplacian variance. Multi-frame averaging (3–5 frames per position) "
-              "cancels OLED refresh flicker and sensor noise:"),
-            Div("score = min(Laplacian(crop).var() / 25000, 1.0)", cls="formula"),
-
-            # ---- SharpnessNet ----
-            H2("SharpnessNet (CNN)"),
-            P("A 3-layer CNN with global average pooling. Trained on synthetic Game of Life "
-              "frames, predicts sharpness in [0, 1]. 3,585 parameters, 15 KB on disk:"),
-            Div(NotStr(f'<pre class="mermaid">\n{MERMAID_MODEL}\n</pre>'), cls="mermaid-wrap"),
-            Table(
-                Tr(Th("Layer"), Th("Operation"), Th("Output"), Th("Params")),
-                Tr(Td("1"), Td("Conv2d(1→8, 3×3) + ReLU + MaxPool"), Td("8 × 16 × 32"), Td("80", cls="mono")),
-                Tr(Td("2"), Td("Conv2d(8→16, 3×3) + ReLU + MaxPool"), Td("16 × 8 × 16"), Td("1,168", cls="mono")),
-                Tr(Td("3"), Td("Conv2d(16→16, 3×3) + ReLU"), Td("16 × 8 × 16"), Td("2,320", cls="mono")),
-                Tr(Td("4"), Td("GlobalAvgPool"), Td("16"), Td("0", cls="mono")),
-                Tr(Td("5"), Td("Linear(16→1) + Sigmoid"), Td("1"), Td("17", cls="mono")),
-                Tr(Td(""), Td(Strong("Total")), Td(""), Td(Strong("3,585"), cls="mono")),
+            Div(
+                Img(src=fft_demo_deskewed_src),
+                Div("Deskewed result", cls="cap"),
+                cls="img-cell",
             ),
+            cls="img-grid cols-4",
+        ),
 
-            # ---- Training Data ----
-            H2("Synthetic Training Data"),
-            P("Each sample is a Game of Life frame rendered at 64×128, resized to 32×64, "
-              "then degraded with Gaussian blur and sensor noise. The sharpness label is "
-              "derived directly from the blur sigma — no human annotation needed."),
+        P("Algorithm:"),
+        Ul(
+            Li("Take a 200x200 crop around the focus center (more periods = sharper peaks)"),
+            Li("Grayscale, multiply by 2D Hanning window (reduces spectral leakage)"),
+            Li(Code("np.fft.fft2"), " → ", Code("fftshift"), " → ", Code("log1p(abs())"),
+               " = magnitude spectrum"),
+            Li("Mask out DC region (radius < 5px from center)"),
+            Li("Find dominant peak in upper half (conjugate symmetry)"),
+            Li("Prominence check: peak must be ≥ 3× median (rejects flat/noisy spectra)"),
+            Li(Code("atan2(dy, dx)"), " → angle in degrees, rotated 90° (peak ⊥ grid), "
+               "normalized to [-45°, 45°]"),
+        ),
+        P("Advantages over contour-based detection:"),
+        Ul(
+            Li(Strong("Zoom-invariant:"), " Works at any magnification where the grid is visible — "
+               "no minimum pixel size required"),
+            Li(Strong("Single-peak aggregation:"), " One dominant peak instead of "
+               "voting across dozens of noisy contour angles"),
+            Li(Strong("Sub-pixel pitch:"), " Even 2–3 camera pixels per OLED pixel "
+               "creates a measurable FFT peak"),
+        ),
+        P("If detected (|angle| > 0.5°), the frame is deskewed via ", Code("cv2.warpAffine"),
+          " before OLED re-detection. This produces tighter, axis-aligned bounding boxes "
+          "and cleaner OLED crops."),
+
+        H3("OLED Re-detection"),
+        P("After the sweep finds best focus and applies any offset, the OLED is "
+          "re-detected on the (possibly deskewed) sharp frame using the full HSV "
+          "pipeline. The post-autofocus photo and OLED crop use this refined bbox. "
+          "If the OLED isn't found, the focus crop is used as fallback."),
+
+        # ---- Scoring ----
+        H2("Sharpness Scoring"),
+        H3("OLED Detection (HSV)"),
+        P("Classical CV pipeline finds the blue OLED region in the camera frame:"),
+        kv_table(
+            ("Step", "Details"),
+            ("Downscale", "INTER_AREA to 1/4 resolution (320x180); bbox scaled back ×4"),
+            ("Color space", "BGR → HSV"),
+            ("Threshold", "H: 90–130, S: 50–255, V: 30–255 (blue glow)"),
+            ("Morphology", "Dilate with 3x3 rect kernel, 2 iterations (at 1/4 scale)"),
+            ("Blob", "Largest connected component (connectedComponentsWithStats), "
+                     "area > 31px at 1/4 scale (500px full-res), bbox ≤ 50% of frame, "
+                     "aspect ratio 1.3–3.0"),
+            ("Fallback", "Focus crop bbox if OLED not detected"),
+        ),
+        H3("Laplacian Score"),
+        P("Crops are extracted, resized to 64x32, CLAHE-normalized, then scored "
+          "via Laplacian variance. Multi-frame averaging (3–5 frames per position) "
+          "cancels OLED refresh flicker and sensor noise:"),
+        Div("score = min(Laplacian(crop).var() / 25000, 1.0)", cls="formula"),
+
+        # ---- SharpnessNet ----
+        H2("SharpnessNet (CNN)"),
+        P("A 3-layer CNN with global average pooling. Trained on synthetic Game of Life "
+          "frames, predicts sharpness in [0, 1]. 3,585 parameters, 15 KB on disk:"),
+        Div(NotStr(_mermaid_html(MERMAID_MODEL, "model-svg")), cls="mermaid-wrap"),
+        kv_table(
+            ("Layer", "Operation", "Output", "Params"),
+            ("1", "Conv2d(1→8, 3×3) + ReLU + MaxPool", "8 × 16 × 32", Td("80", cls="mono")),
+            ("2", "Conv2d(8→16, 3×3) + ReLU + MaxPool", "16 × 8 × 16", Td("1,168", cls="mono")),
+            ("3", "Conv2d(16→16, 3×3) + ReLU", "16 × 8 × 16", Td("2,320", cls="mono")),
+            ("4", "GlobalAvgPool", "16", Td("0", cls="mono")),
+            ("5", "Linear(16→1) + Sigmoid", "1", Td("17", cls="mono")),
+            ("", Strong("Total"), "", Td(Strong("3,585"), cls="mono")),
+        ),
 
-            H3("Blur Progression"),
-            P("Same GoL pattern (density 25%, 8 evolution steps) at increasing blur levels. "
-              "As sigma increases, high-frequency pixel edges wash out:"),
-            Div(
-                *[Div(
-                    Img(src=uri),
-                    Div(Span(f"σ = {sigma:.1f}", cls="hi"), Br(),
-                        f"score = {label:.3f}", cls="cap"),
-                    cls="img-cell",
-                ) for sigma, label, uri in blur_samples],
-                cls="img-grid cols-5",
-            ),
+        # ---- Training Data ----
+        H2("Synthetic Training Data"),
+        P("Each sample is a Game of Life frame rendered at 64×128, resized to 32×64, "
+          "then degraded with Gaussian blur and sensor noise. The sharpness label is "
+          "derived directly from the blur sigma — no human annotation needed."),
 
-            H3("Pattern Variety"),
-            P("Different initial densities and evolution steps produce diverse pixel patterns — "
-              "from sparse gliders to dense still-lifes:"),
-            Div(
-                *[Div(
-                    Img(src=uri),
-                    Div(f"{dens:.0%} density, {steps} steps", cls="cap"),
-                    cls="img-cell",
-                ) for dens, steps, uri in density_samples],
-                cls="img-grid cols-4",
-            ),
+        H3("Blur Progression"),
+        P("Same GoL pattern (density 25%, 8 evolution steps) at increasing blur levels. "
+          "As sigma increases, high-frequency pixel edges wash out:"),
+        Div(
+            *[Div(
+                Img(src=src),
+                Div(Span(f"σ = {sigma:.1f}", cls="hi"), Br(),
+                    f"score = {label:.3f}", cls="cap"),
+                cls="img-cell",
+            ) for sigma, label, src in blur_samples],
+            cls="img-grid cols-5",
+        ),
 
-            P("The full training set has 2,000 samples: density uniform in 5–40%, "
-              "evolution steps 0–20, blur sigma uniform in 0–4. "
-              "Generated in ~5s on a Raspberry Pi 5."),
-
-            H3("Sharpness Label"),
-            P("The label maps blur sigma to a sharpness score in [0, 1]:"),
-            Div("label = 1 / (1 + σ²)", cls="formula"),
-            Table(
-                Tr(Th("σ (blur)"), Th("0.0"), Th("0.5"), Th("1.0"), Th("2.0"), Th("4.0")),
-                Tr(Td("label"), Td("1.000", cls="mono"), Td("0.800", cls="mono"),
-                   Td("0.500", cls="mono"), Td("0.200", cls="mono"), Td("0.059", cls="mono")),
-            ),
+        H3("Pattern Variety"),
+        P("Different initial densities and evolution steps produce diverse pixel patterns — "
+          "from sparse gliders to dense still-lifes:"),
+        Div(
+            *[Div(
+                Img(src=src),
+                Div(f"{dens:.0%} density, {steps} steps", cls="cap"),
+                cls="img-cell",
+            ) for dens, steps, src in density_samples],
+            cls="img-grid cols-4",
+        ),
 
-            # ---- Training Loss ----
-            H2("Training"),
-            Table(
-                Tr(Th("Parameter"), Th("Value")),
-                Tr(Td("Optimizer"), Td("Adam")),
-                Tr(Td("Learning rate"), Td(Code("1e-3"))),
-                Tr(Td("Batch size"), Td("128")),
-                Tr(Td("Training steps"), Td("200")),
-                Tr(Td("Loss function"), Td("MSE (mean squared error)")),
-                Tr(Td("Wall time"), Td("~30s on Raspberry Pi 5 CPU (tinygrad)")),
-                Tr(Td("Model size"), Td(f"{model_size} (safetensors)")),
-                Tr(Td("Last trained"), Td(model_date)),
-            ),
-            P("MSE loss over 200 Adam steps. Converges to ~0.01 in the first 80 steps:"),
-            Div(NotStr(loss_svg), cls="chart-wrap"),
-
-            # ---- Evaluation ----
-            H2("Evaluation"),
-            P("CNN predictions vs ground truth on held-out samples. "
-              "Mean absolute error is ~0.02 — well within the noise floor "
-              "of real camera captures:"),
-            Table(
-                Tr(Th("Sample"), Th("σ"), Th("True"), Th("Predicted"), Th("Error")),
-                *[Tr(
-                    Td(Img(src=uri, style="height:40px;image-rendering:pixelated;border:1px solid #333;border-radius:2px;vertical-align:middle;")),
-                    Td(f"{sigma:.1f}"),
-                    Td(f"{true_v:.3f}", cls="mono"),
-                    Td(f"{pred_v:.3f}", cls="mono"),
-                    Td(f"{err:.3f}", cls="mono"),
-                ) for uri, sigma, true_v, pred_v, err in eval_rows],
-                Tr(Td(""), Td(""), Td(""), Td(Strong("MAE")),
-                   Td(Strong(f"{np.mean([r[4] for r in eval_rows]):.3f}"), cls="mono")),
-            ),
+        P("The full training set has 2,000 samples: density uniform in 5–40%, "
+          "evolution steps 0–20, blur sigma uniform in 0–4. "
+          "Generated in ~5s on a Raspberry Pi 5."),
+
+        H3("Sharpness Label"),
+        P("The label maps blur sigma to a sharpness score in [0, 1]:"),
+        Div("label = 1 / (1 + σ²)", cls="formula"),
+        Table(
+            Tr(Th("σ (blur)"), Th("0.0"), Th("0.5"), Th("1.0"), Th("2.0"), Th("4.0")),
+            Tr(Td("label"), Td("1.000", cls="mono"), Td("0.800", cls="mono"),
+               Td("0.500", cls="mono"), Td("0.200", cls="mono"), Td("0.059", cls="mono")),
+        ),
 
-            # ---- Reproduce ----
-            H2("Reproduce"),
-            Pre(Code(
-                "# Install dependencies\n"
-                "pip install tinygrad opencv-python numpy\n"
-                "sudo apt install v4l-utils\n"
-                "\n"
-                "# Train the model (~35s on RPi5)\n"
-                "python camera/autofocus.py train\n"
-                "\n"
-                "# Run autofocus\n"
-                "python camera/autofocus.py focus\n"
-                "\n"
-                "# Full diagnostic sweep (all 51 focus levels)\n"
-                "python camera/autofocus.py sweep"
-            )),
-            H3("Adapting to Your Setup"),
-            Ul(
-                Li(Strong("Different camera:"), " Change ", Code("CAM_DEV"), " and ", Code("CAM_W/CAM_H/CAM_FPS"), " in autofocus.py"),
-                Li(Strong("Different display:"), " Adjust HSV thresholds in ", Code("find_oled()"), " for your display's color"),
-                Li(Strong("Different scene:"), " The Laplacian component works with any high-frequency content; "
-                   "retrain the CNN on synthetic frames matching your scene"),
-            ),
+        # ---- Training Loss ----
+        H2("Training"),
+        kv_table(
+            ("Parameter", "Value"),
+            ("Optimizer", "Adam"),
+            ("Learning rate", Code("1e-3")),
+            ("Batch size", "128"),
+            ("Training steps", "200"),
+            ("Loss function", "MSE (mean squared error)"),
+            ("Wall time", "~30s on Raspberry Pi 5 CPU (tinygrad)"),
+            ("Model size", f"{_MODEL_SIZE_SLOT} (safetensors)"),
+            ("Last trained", _MODEL_DATE_SLOT),
+            ("Weights", A(MODEL_PATH.name, href="/model")),
+        ),
+        P("MSE loss over 200 Adam steps. Converges to ~0.01 in the first 80 steps:"),
+        Div(NotStr(loss_svg), cls="chart-wrap"),
+
+        # ---- Evaluation ----
+        H2("Evaluation"),
+        P("CNN predictions vs ground truth on held-out samples. "
+          "Mean absolute error is ~0.02 — well within the noise floor "
+          "of real camera captures:"),
+        Table(
+            Tr(Th("Sample"), Th("σ"), Th("True"), Th("Predicted"), Th("Error")),
+            *[Tr(
+                Td(Img(src=src, style="height:40px;image-rendering:pixelated;border:1px solid #333;border-radius:2px;vertical-align:middle;")),
+                Td(f"{sigma:.1f}"),
+                Td(f"{true_v:.3f}", cls="mono"),
+                Td(f"{pred_v:.3f}", cls="mono"),
+                Td(f"{err:.3f}", cls="mono"),
+            ) for src, sigma, true_v, pred_v, err in eval_rows],
+            Tr(Td(""), Td(""), Td(""), Td(Strong("MAE")),
+               Td(Strong(f"{np.mean([r[4] for r in eval_rows]):.3f}"), cls="mono")),
+        ),
 
-            # ---- Source ----
-            H2("Source"),
-            Pre(Code(
-                "camera/\n"
-                "├── autofocus.py                  # training + autofocus logic\n"
-                "├── autofocus_model.safetensors   # trained weights (15 KB)\n"
-                "└── app.py                        # web UI (this site)"
-            )),
-            cls="af-page",
+        # ---- Reproduce ----
+        H2("Reproduce"),
+        Pre(Code(
+            "# Install dependencies\n"
+            "pip install tinygrad opencv-python numpy\n"
+            "sudo apt install v4l-utils\n"
+            "\n"
+            "# Train the model (~35s on RPi5)\n"
+            "python camera/autofocus.py train\n"
+            "\n"
+            "# Run autofocus\n"
+            "python camera/autofocus.py focus\n"
+            "\n"
+            "# Full diagnostic sweep (all 51 focus levels)\n"
+            "python camera/autofocus.py sweep"
+        )),
+        H3("Adapting to Your Setup"),
+        Ul(
+            Li(Strong("Different camera:"), " Change ", Code("CAM_DEV"), " and ", Code("CAM_W/CAM_H/CAM_FPS"), " in autofocus.py"),
+            Li(Strong("Different display:"), " Adjust HSV thresholds in ", Code("find_oled()"), " for your display's color"),
+            Li(Strong("Different scene:"), " The Laplacian component works with any high-frequency content; "
+               "retrain the CNN on synthetic frames matching your scene"),
         ),
-    )
+
+        # ---- Source ----
+        H2("Source"),
+        Pre(Code(
+            "camera/\n"
+            "├── autofocus.py                  # training + autofocus logic\n"
+            "├── autofocus_model.safetensors   # trained weights (15 KB)\n"
+            "└── app.py                        # web UI (this site)"
+        )),
+        cls="af-page",
+    ))
+
+
+@functools.lru_cache(maxsize=4)
+def _fmt_model_meta(mtime_ns: int, size: int) -> tuple[str, str]:
+    """(size, last-trained date) strings for the docs page, keyed by file mtime."""
+    return (f"{size / 1024:.1f} KB",
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime_ns / 1e9)))
+
+
+@functools.lru_cache(maxsize=8)
+def _docs_page_bytes(model_size: str, model_date: str,
+                     canonical: str | None) -> tuple[bytes, bytes, str]:
+    """Full /docs document as (html, gzipped html, etag), rebuilt only after a retrain.
+
+    Thumbnails are separate /docs/img requests, so this is mostly markup and
+    inline SVG; compressing it once here beats paying zlib on every request.
+    """
+    body = _docs_body_html().replace(_MODEL_SIZE_SLOT, model_size).replace(_MODEL_DATE_SLOT, model_date)
+    page = to_xml(Html(
+        Head(
+            Title("OLED Autofocus — System Documentation"),
+            Style(CSS),
+            Link(rel="canonical", href=canonical) if canonical else "",
+            *app.hdrs,
+        ),
+        Body(
+            # Only needed if mmdc wasn't available to pre-render the diagrams
+            Script(_MERMAID_JS, type="module") if 'class="mermaid"' in body else "",
+            H1("OLED Autofocus // System Documentation"),
+            nav_bar("docs"),
+            NotStr(body),
+        ),
+    )).encode()
+    # Weak: the gzip and identity variants share it, as equivalent representations
+    etag = f'W/"{hashlib.sha1(page).hexdigest()[:16]}"'
+    return page, gzip.compress(page, 9), etag
+
+
+@rt("/model")
+def model_file():
+    """Trained SharpnessNet weights; FileResponse streams the file via sendfile."""
+    try:
+        st = MODEL_PATH.stat()  # handed to FileResponse so it doesn't stat again
+    except FileNotFoundError:
+        return Response("Model not trained", status_code=404)
+    return FileResponse(MODEL_PATH, media_type="application/octet-stream",
+                        filename=MODEL_PATH.name, stat_result=st)
+
+
+@rt("/docs/img/{key}")
+def docs_image(req, key: str):
+    """Docs thumbnail by content hash; immutable, so revalidation is a bare 304."""
+    _docs_body_html()  # populates _DOCS_IMAGES on first hit after a restart
+    data = _DOCS_IMAGES.get(key)
+    if data is None:
+        return Response("Not found", status_code=404)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if req.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(data, media_type="image/webp", headers=headers)
+
+
+@rt("/docs")
+def docs_page(req):
+    try:
+        st = MODEL_PATH.stat()
+        model_size, model_date = _fmt_model_meta(st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        model_size, model_date = "not trained", "—"
+    # Same canonical link FastHTML adds to the pages it renders itself, minus
+    # the query string, so "/docs?x=N" can't mint new cache entries
+    canonical = f"https://{req.url.netloc}{req.url.path}" if app.canonical else None
+    page, page_gz, etag = _docs_page_bytes(model_size, model_date, canonical)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
+    if etag in req.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in req.headers.get("accept-encoding", ""):
+        return Response(page_gz, media_type="text/html",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(page, media_type="text/html", headers=headers)
 
 
 # ---------------------------------------------------------------------------
@@ -2135,6 +2515,8 @@ def docs_page():
 @app.on_event("startup")
 def on_startup():
     cam.open()
+    # Build the cached docs body (GoL samples, thumbnails) off the request path
+    threading.Thread(target=_docs_body_html, daemon=True).start()
 
 
 @app.on_event("shutdown")
@@ -2148,4 +2530,7 @@ def on_shutdown():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    # loop/http "auto" already pick uvloop + httptools when installed (uvicorn[standard]);
+    # the per-request access log is a synchronous write on every MJPEG/status poll.
+    uvicorn.run(app, host="0.0.0.0", port=PORT, loop="auto", http="auto",
+                access_log=False, log_level="warning")
@@ -5,18 +5,32 @@ Finds optimal manual focus for a Logitech BRIO pointing at an SSD1306
 
 Usage:
     python autofocus.py train   # generate synthetic data + train CNN (~40s)
+    python autofocus.py quantize  # write int8 weights next to the float model
     python autofocus.py focus   # run coarse→fine autofocus sweep (~15s)
+    python autofocus.py focus --verify  # ...and re-capture the winner at the end
     python autofocus.py sweep   # full 51-level diagnostic sweep
+    python autofocus.py focus --int8  # focus/sweep with the quantized weights
 """
 
+import fcntl
+import os
+import struct
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 import cv2
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy/OpenCV equivalents
+    njit, prange = None, range
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -24,26 +38,56 @@ import numpy as np
 CAM_DEV = "/dev/video1"
 CAM_W, CAM_H, CAM_FPS = 1280, 720, 15
 MODEL_PATH = Path(__file__).parent / "autofocus_model.safetensors"
+QMODEL_PATH = MODEL_PATH.with_suffix(".int8.safetensors")
 FOCUS_MIN, FOCUS_MAX, FOCUS_STEP = 0, 255, 5
+DETECT_SCALE = 4   # OLED detection downsample factor
+MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # mask dilation
+CROP_W, CROP_H = 64, 32  # scoring crop fed to the Laplacian and the CNN
 SETTLE_MS = 300
 
 # ---------------------------------------------------------------------------
 # Camera helpers
 # ---------------------------------------------------------------------------
 
-def set_focus(value: int):
-    """Set manual focus via v4l2-ctl."""
-    subprocess.run(
-        ["v4l2-ctl", "-d", CAM_DEV, "--set-ctrl", f"focus_absolute={value}"],
-        capture_output=True,
-    )
+# V4L2 control IDs (linux/v4l2-controls.h) for the v4l2-ctl names used here
+V4L2_CIDS = {
+    "brightness": 0x00980900, "contrast": 0x00980901, "saturation": 0x00980902,
+    "white_balance_automatic": 0x0098090C, "gain": 0x00980913,
+    "white_balance_temperature": 0x0098091A, "sharpness": 0x0098091B,
+    "backlight_compensation": 0x0098091C,
+    "auto_exposure": 0x009A0901, "exposure_time_absolute": 0x009A0902,
+    "pan_absolute": 0x009A0908, "tilt_absolute": 0x009A0909,
+    "focus_absolute": 0x009A090A, "focus_automatic_continuous": 0x009A090C,
+    "zoom_absolute": 0x009A090D,
+}
+VIDIOC_S_CTRL = 0xC008561C  # _IOWR('V', 28, struct v4l2_control { __u32 id; __s32 value; })
+
+_ctrl_fd: int | None = None
 
 def set_ctrl(name: str, value: int):
+    """Set a V4L2 control: one VIDIOC_S_CTRL ioctl, or v4l2-ctl for unmapped names.
+
+    Rejected values are ignored, as they were with v4l2-ctl.
+    """
+    global _ctrl_fd
+    cid = V4L2_CIDS.get(name)
+    if cid is not None:
+        if _ctrl_fd is None:
+            _ctrl_fd = os.open(CAM_DEV, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(_ctrl_fd, VIDIOC_S_CTRL, struct.pack("Ii", cid, value))
+        except OSError:
+            pass
+        return
     subprocess.run(
         ["v4l2-ctl", "-d", CAM_DEV, "--set-ctrl", f"{name}={value}"],
         capture_output=True,
     )
 
+def set_focus(value: int):
+    """Set manual focus."""
+    set_ctrl("focus_absolute", value)
+
 def open_camera() -> cv2.VideoCapture:
     cap = cv2.VideoCapture(CAM_DEV, cv2.CAP_V4L2)
     fourcc = cv2.VideoWriter_fourcc(*"MJPG")
@@ -51,90 +95,195 @@ def open_camera() -> cv2.VideoCapture:
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
     cap.set(cv2.CAP_PROP_FPS, CAM_FPS)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # at most one stale frame queued
+    cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)  # hand back MJPEG bytes; capture_frame decodes
     if not cap.isOpened():
         raise RuntimeError(f"Cannot open camera {CAM_DEV}")
     return cap
 
-def capture_frame(cap: cv2.VideoCapture) -> np.ndarray:
-    """Capture a frame, discarding the first read to flush stale buffer."""
-    cap.read()  # discard buffered frame
-    ok, frame = cap.read()
+_IMREAD_REDUCED = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2}
+
+def capture_frame(cap: cv2.VideoCapture, reduce: int = 1) -> np.ndarray:
+    """Capture a frame, discarding the first one to flush the stale buffer.
+
+    open_camera() asks for a single driver buffer, so that one grab is the
+    whole backlog: the frame queued while the lens was still moving. It is
+    only grabbed, never decoded. With reduce=2 the MJPEG is decoded at half
+    size by libjpeg's DCT-domain scaling, which never materialises the
+    full-size image.
+    """
+    cap.grab()  # discard buffered frame
+    ok = cap.grab()
+    if ok:
+        ok, buf = cap.retrieve()
     if not ok:
         raise RuntimeError("Failed to capture frame")
+    if buf.ndim == 3:  # backend decoded anyway
+        if reduce == 1:
+            return buf
+        return cv2.resize(buf, (buf.shape[1] // reduce, buf.shape[0] // reduce),
+                          interpolation=cv2.INTER_AREA)
+    frame = cv2.imdecode(buf, _IMREAD_REDUCED[reduce])
+    if frame is None:
+        raise RuntimeError("Corrupt frame")
     return frame
 
 # ---------------------------------------------------------------------------
 # Synthetic data generation
 # ---------------------------------------------------------------------------
 
+# Grids are stepped bit-packed: bit b of uint64 word k in a row is cell 64k+b,
+# so a 128-wide row is two words and one bitwise op updates 64 cells.
+_ONE, _S63 = np.uint64(1), np.uint64(63)
+
+def pack_grid(grid: np.ndarray) -> np.ndarray:
+    """0/1 uint8 grid (..., H, W) -> (..., H, W/64) uint64; W must be a multiple of 64."""
+    return np.packbits(grid, axis=-1, bitorder="little").view("<u8")
+
+def unpack_grid(words: np.ndarray) -> np.ndarray:
+    """Inverse of pack_grid."""
+    return np.unpackbits(words.view(np.uint8), axis=-1, bitorder="little")
+
+def _west_east(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Planes whose bit x holds cell x-1 / x+1 of `rows`, wrapping across words."""
+    return ((rows << _ONE) | (np.roll(rows, 1, axis=-1) >> _S63),
+            (rows >> _ONE) | (np.roll(rows, -1, axis=-1) << _S63))
+
+def gol_step_packed(words: np.ndarray) -> np.ndarray:
+    """One Game of Life step on packed grids (see pack_grid), torus-wrapped.
+
+    The eight neighbour planes go through a carry-save adder tree into a
+    3-bit count (mod 8; a full 8 never matters), instead of eight uint8 rolls.
+    """
+    up = np.roll(words, 1, axis=-2)
+    dn = np.roll(words, -1, axis=-2)
+    uw, ue = _west_east(up)
+    mw, me = _west_east(words)
+    dw, de = _west_east(dn)
+    s1 = uw ^ up ^ ue
+    c1 = (uw & up) | (ue & (uw ^ up))
+    s2 = mw ^ me ^ dw
+    c2 = (mw & me) | (dw & (mw ^ me))
+    s3 = dn ^ de
+    c3 = dn & de
+    ones = s1 ^ s2 ^ s3
+    c4 = (s1 & s2) | (s3 & (s1 ^ s2))
+    t1 = c1 ^ c2 ^ c3
+    c5 = (c1 & c2) | (c3 & (c1 ^ c2))
+    twos = t1 ^ c4
+    fours = c5 ^ (t1 & c4)
+    return twos & ~fours & (ones | words)  # born on 3, survives on 2 or 3
+
 def gol_step(grid: np.ndarray) -> np.ndarray:
-    """One step of Conway's Game of Life."""
-    neighbors = np.zeros_like(grid)
-    for dy in (-1, 0, 1):
-        for dx in (-1, 0, 1):
-            if dy == 0 and dx == 0:
-                continue
-            neighbors += np.roll(np.roll(grid, dy, axis=0), dx, axis=1)
-    return ((neighbors == 3) | ((grid == 1) & (neighbors == 2))).astype(np.uint8)
+    """One step of Conway's Game of Life on the last two axes (HxW or NxHxW)."""
+    return unpack_grid(gol_step_packed(pack_grid(grid)))
+
+def _gol_evolve_fused(words: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    """Evolve each packed grid of an (N, H, W/64) stack for its own step count.
+
+    The gol_step_packed adder tree one word at a time, ping-ponging between
+    two buffers per grid, so a step allocates nothing; grids run in parallel.
+    """
+    one, s63 = np.uint64(1), np.uint64(63)
+    g, h, n = words.shape
+    out = np.empty_like(words)
+    for i in prange(g):
+        cur = words[i].copy()
+        nxt = np.empty_like(cur)
+        for _ in range(steps[i]):
+            for y in range(h):
+                yu = y - 1 if y > 0 else h - 1
+                yd = y + 1 if y < h - 1 else 0
+                for w in range(n):
+                    wl = w - 1 if w > 0 else n - 1
+                    wr = w + 1 if w < n - 1 else 0
+                    mid = cur[y, w]
+                    up = cur[yu, w]
+                    dn = cur[yd, w]
+                    uw = (up << one) | (cur[yu, wl] >> s63)
+                    ue = (up >> one) | (cur[yu, wr] << s63)
+                    mw = (mid << one) | (cur[y, wl] >> s63)
+                    me = (mid >> one) | (cur[y, wr] << s63)
+                    dw = (dn << one) | (cur[yd, wl] >> s63)
+                    de = (dn >> one) | (cur[yd, wr] << s63)
+                    s1 = uw ^ up ^ ue
+                    c1 = (uw & up) | (ue & (uw ^ up))
+                    s2 = mw ^ me ^ dw
+                    c2 = (mw & me) | (dw & (mw ^ me))
+                    s3 = dn ^ de
+                    c3 = dn & de
+                    ones = s1 ^ s2 ^ s3
+                    c4 = (s1 & s2) | (s3 & (s1 ^ s2))
+                    t1 = c1 ^ c2 ^ c3
+                    c5 = (c1 & c2) | (c3 & (c1 ^ c2))
+                    twos = t1 ^ c4
+                    fours = c5 ^ (t1 & c4)
+                    nxt[y, w] = twos & ~fours & (ones | mid)
+            cur, nxt = nxt, cur
+        out[i] = cur
+    return out
+
+def _gol_evolve_np(words: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    # Step the whole stack together; each grid freezes once its count is reached
+    words = words.copy()
+    for k in range(int(steps.max(initial=0))):
+        active = steps > k
+        words[active] = gol_step_packed(words[active])
+    return words
+
+gol_evolve_packed = (njit(parallel=True, cache=True)(_gol_evolve_fused) if njit
+                     else _gol_evolve_np)
 
 def random_gol_frame(rng: np.random.Generator, density: float, steps: int) -> np.ndarray:
     """Generate a random Game of Life frame (64x128)."""
-    grid = (rng.random((64, 128)) < density).astype(np.uint8)
-    for _ in range(steps):
-        grid = gol_step(grid)
-    return grid
-
-def _add_pixel_grid(frame: np.ndarray, cell_px: int = 4) -> np.ndarray:
-    """Upscale binary GoL frame and add 1px black grid lines between cells.
+    words = pack_grid((rng.random((1, 64, 128)) < density).astype(np.uint8))
+    return unpack_grid(gol_evolve_packed(words, np.array([steps])))[0]
 
-    Simulates the visible pixel gaps on a real SSD1306 OLED.
-    Each cell becomes cell_px x cell_px with a 1px black border.
-    """
-    h, w = frame.shape
-    big = cv2.resize(frame.astype(np.float32), (w * cell_px, h * cell_px),
-                     interpolation=cv2.INTER_NEAREST)
-    big[::cell_px, :] = 0  # horizontal lines
-    big[:, ::cell_px] = 0  # vertical lines
-    return big
+# A lit cell renders as 4x4 OLED pixels with a 1px black grid line (the
+# visible pixel gaps on a real SSD1306), i.e. 9 of 16 pixels at 255. Area
+# averaging the 512x256 render down to 64x32 covers 2x2 cells per output
+# pixel, so the rendered crop is just a lookup on each block's lit count.
+CELL_AREA_LUT = np.round(np.arange(5) * (9 * 255 / 64)).astype(np.uint8)
 
 def generate_dataset(n_samples: int = 2000, seed: int = 42):
     """Generate synthetic GoL frames with varying blur for sharpness training."""
     rng = np.random.default_rng(seed)
-    X = np.empty((n_samples, 1, 32, 64), dtype=np.float32)
-    Y = np.empty((n_samples, 1), dtype=np.float32)
+    density = rng.uniform(0.05, 0.40, n_samples)
+    steps = rng.integers(0, 21, n_samples)
+    sigmas = rng.uniform(0.0, 4.0, n_samples)  # Gaussian blur sigma 0–4
 
-    for i in range(n_samples):
-        density = rng.uniform(0.05, 0.40)
-        steps = rng.integers(0, 21)
-        frame = random_gol_frame(rng, density, steps)
+    # Evolve the whole batch at once; each grid stops after its own step count
+    grids = (rng.random((n_samples, 64, 128)) < density[:, None, None]).astype(np.uint8)
+    grids = unpack_grid(gol_evolve_packed(pack_grid(grids), steps))
 
-        # Render with pixel grid lines, then downscale with area averaging
-        grid_frame = _add_pixel_grid(frame, cell_px=4)
-        small = cv2.resize(grid_frame, (64, 32),
-                           interpolation=cv2.INTER_AREA)
+    # Render with pixel grid lines + area downscale, for the whole batch
+    counts = grids.reshape(n_samples, CROP_H, 2, CROP_W, 2).sum(axis=(2, 4), dtype=np.uint8)
+    X = CELL_AREA_LUT[counts].astype(np.float32) * (1 / 255)
 
-        # Apply Gaussian blur (sigma 0–4)
-        sigma = rng.uniform(0.0, 4.0)
+    for img, sigma in zip(X, sigmas):
         if sigma > 0.3:
             ksize = int(np.ceil(sigma * 3)) * 2 + 1
-            small = cv2.GaussianBlur(small, (ksize, ksize), sigma)
-
-        # Add sensor noise
-        small += rng.normal(0, 0.02, small.shape).astype(np.float32)
-        small = np.clip(small, 0, 1)
+            img[:] = cv2.GaussianBlur(img, (ksize, ksize), sigma)
 
-        X[i, 0] = small
-        Y[i, 0] = 1.0 / (1.0 + sigma * sigma)
+    # Add sensor noise in one draw for the batch. All draws are batch-wise
+    # (params, then grids, then noise), so a given seed yields a different
+    # dataset than the old per-sample loop did.
+    X += rng.normal(0, 0.02, X.shape).astype(np.float32)
+    np.clip(X, 0, 1, out=X)
 
-    return X, Y
+    Y = (1.0 / (1.0 + sigmas * sigmas)).astype(np.float32).reshape(-1, 1)
+    return X[:, None], Y
 
 # ---------------------------------------------------------------------------
 # SharpnessNet (tinygrad, 3585 params)
 # ---------------------------------------------------------------------------
 
-from tinygrad import Tensor, nn
-from tinygrad.nn.state import safe_save, safe_load, get_state_dict, get_parameters, load_state_dict
-from tinygrad.engine.jit import TinyJit
+try:
+    from tinygrad import Tensor, nn
+    from tinygrad.nn.state import safe_save, safe_load, get_state_dict, get_parameters, load_state_dict
+    from tinygrad.engine.jit import TinyJit
+except ImportError:  # only train/quantize/focus/sweep need it; app.py imports the CV helpers
+    Tensor = nn = TinyJit = None
 
 class SharpnessNet:
     def __init__(self):
@@ -144,6 +293,7 @@ class SharpnessNet:
         self.fc = nn.Linear(16, 1)                   # 17 params
 
     def __call__(self, x: Tensor) -> Tensor:
+        # Shapes for the default 32x64 crop; global pooling makes any size work
         x = self.c1(x).relu().max_pool2d(kernel_size=2)   # → Bx8x16x32
         x = self.c2(x).relu().max_pool2d(kernel_size=2)   # → Bx16x8x16
         x = self.c3(x).relu()                              # → Bx16x8x16
@@ -189,49 +339,140 @@ def train(n_steps: int = 200, batch_size: int = 128, lr: float = 1e-3):
 
     safe_save(get_state_dict(model), str(MODEL_PATH))
     print(f"Model saved to {MODEL_PATH}")
+    QMODEL_PATH.unlink(missing_ok=True)  # stale int8 copy of the old weights
 
 # ---------------------------------------------------------------------------
 # Load model
 # ---------------------------------------------------------------------------
 
-def load_model() -> SharpnessNet:
+def load_model(path: Path = MODEL_PATH) -> SharpnessNet:
+    """Load float weights, or int8 weights written by quantize_model()."""
     model = SharpnessNet()
-    load_state_dict(model, safe_load(str(MODEL_PATH)))
+    state = safe_load(str(path))
+    for key in [k for k in state if k.endswith(".scale")]:
+        name = key.removesuffix(".scale")
+        q, scale = state.pop(name), state.pop(key)
+        state[name] = q.float() * scale.reshape(-1, *[1] * (q.ndim - 1))
+    load_state_dict(model, state)
     return model
 
+def quantize_model():
+    """Write an int8 copy of the trained weights to QMODEL_PATH.
+
+    Symmetric per-output-channel quantization: w ~= q * scale with q in
+    [-127, 127]. Biases stay float32. load_model() dequantizes on load.
+    """
+    state = {}
+    for name, t in get_state_dict(load_model()).items():
+        w = t.numpy()
+        if w.ndim < 2:
+            state[name] = t
+            continue
+        scale = np.abs(w.reshape(w.shape[0], -1)).max(axis=1).clip(min=1e-8) / 127.0
+        bshape = (-1,) + (1,) * (w.ndim - 1)
+        q = np.round(w / scale.reshape(bshape)).clip(-127, 127).astype(np.int8)
+        state[name] = Tensor(q)
+        state[name + ".scale"] = Tensor(scale.astype(np.float32))
+        err = np.abs(q * scale.reshape(bshape) - w).max()
+        print(f"  {name:12s} {str(w.shape):16s} max abs err {err:.2e}")
+    safe_save(state, str(QMODEL_PATH))
+    print(f"Quantized model saved to {QMODEL_PATH}")
+
+SCORE_BATCH = 8  # crops per jitted forward pass; covers the 7 coarse positions
+
+Scorer = Callable[[np.ndarray], np.ndarray]  # (N, 1, CROP_H, CROP_W) float32 crops -> (N,) scores
+
+def jit_scorer(model: SharpnessNet, batch: int = SCORE_BATCH) -> Scorer:
+    """Wrap batched inference in TinyJit and warm it up.
+
+    TinyJit captures the kernels on its second call and replays them after
+    that, so the two dummy calls here keep graph building and codegen out
+    of the sweep loop. The jit is fixed to `batch` crops per call; the
+    returned scorer runs any N as ceil(N / batch) zero-padded passes.
+    """
+    @TinyJit
+    def infer(x: Tensor) -> Tensor:
+        return model(x).realize()
+
+    buf = np.zeros((batch, 1, CROP_H, CROP_W), dtype=np.float32)
+    for _ in range(2):
+        infer(Tensor(buf))
+
+    def score(crops: np.ndarray) -> np.ndarray:
+        out = np.empty(len(crops), dtype=np.float32)
+        for i in range(0, len(crops), batch):
+            n = min(batch, len(crops) - i)
+            buf[:n] = crops[i:i + n]
+            buf[n:] = 0
+            out[i:i + n] = infer(Tensor(buf)).numpy()[:n, 0]
+        return out
+    return score
+
 # ---------------------------------------------------------------------------
 # OLED detection (classical CV)
 # ---------------------------------------------------------------------------
 
+def _blue_mask_fused(img: np.ndarray) -> np.ndarray:
+    """Blue-glow mask straight from BGR, without building an HSV image.
+
+    Equivalent to inRange(cvtColor(img, BGR2HSV), (90, 50, 30), (130, 255, 255))
+    up to OpenCV's fixed-point rounding at the hue edges: V = max >= 30,
+    S = 255*(V-min)/V >= 49.5, and hue in [179, 261] degrees, where blue or
+    green is the max channel.
+    """
+    h, w = img.shape[:2]
+    out = np.empty((h, w), np.uint8)
+    for y in prange(h):
+        for x in range(w):
+            b = np.int32(img[y, x, 0])
+            g = np.int32(img[y, x, 1])
+            r = np.int32(img[y, x, 2])
+            v = max(b, g, r)
+            d = v - min(b, g, r)
+            if v < 30 or 510 * d < 99 * v or r == v:
+                hit = False
+            elif b == v:
+                hit = 20 * (r - g) <= 7 * d        # hue <= 261 (H <= 130)
+            else:
+                hit = 60 * (b - r) >= 59 * d       # hue >= 179 (H >= 90)
+            out[y, x] = 255 if hit else 0
+    return out
+
+def _blue_mask_cv(img: np.ndarray) -> np.ndarray:
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    return cv2.inRange(hsv, (90, 50, 30), (130, 255, 255))
+
+blue_mask = njit(parallel=True, cache=True)(_blue_mask_fused) if njit else _blue_mask_cv
+
 def find_oled(frame_bgr: np.ndarray) -> tuple[int, int, int, int] | None:
     """Find the OLED screen region via blue HSV threshold.
 
+    Works on a 1/DETECT_SCALE downsampled frame and scales the result back up.
     Returns (x, y, w, h) bounding box or None.
     """
-    hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
+    s = DETECT_SCALE
+    fh, fw = frame_bgr.shape[:2]
+    small = cv2.resize(frame_bgr, (fw // s, fh // s), interpolation=cv2.INTER_AREA)
     # Blue OLED glow: H 90–130, S 50–255, V 30–255
-    mask = cv2.inRange(hsv, (90, 50, 30), (130, 255, 255))
-    # Dilate to fill gaps between pixels
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
-    mask = cv2.dilate(mask, kernel, iterations=2)
+    mask = blue_mask(small)
+    # Dilate to fill gaps between pixels (3x3 at 1/4 scale ~ 7x7 at full res)
+    mask = cv2.dilate(mask, MORPH_KERNEL, iterations=2)
 
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not contours:
+    # Largest blob: one labelling pass yields every bbox and pixel area
+    n, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
-
-    # Largest contour
-    c = max(contours, key=cv2.contourArea)
-    area = cv2.contourArea(c)
-    if area < 500:  # too small
+    i = 1 + int(stats[1:, cv2.CC_STAT_AREA].argmax())  # label 0 is background
+    x, y, w, h, area = map(int, stats[i])
+    if area < 500 / (s * s):  # too small
         return None
 
-    x, y, w, h = cv2.boundingRect(c)
     aspect = w / max(h, 1)
     # OLED is 128x64 = 2:1; allow 1.3–3.0 for perspective
     if not (1.3 < aspect < 3.0):
         return None
 
-    return (x, y, w, h)
+    return (x * s, y * s, w * s, h * s)
 
 def center_crop(frame_bgr: np.ndarray) -> tuple[int, int, int, int]:
     """Fallback: crop center 40% of frame."""
@@ -244,28 +485,91 @@ def center_crop(frame_bgr: np.ndarray) -> tuple[int, int, int, int]:
 # Sharpness scoring (hybrid Laplacian + CNN)
 # ---------------------------------------------------------------------------
 
+def _laplacian_var_fused(img: np.ndarray) -> float:
+    """Variance of the 3x3 Laplacian of a uint8 image in one pass.
+
+    Same result as cv2.Laplacian(img, cv2.CV_64F).var() (4-neighbour kernel,
+    BORDER_REFLECT_101) without materialising the float64 filter output.
+    Integer sums are exact: |L| <= 1020, so L*L summed over a crop fits int64.
+    """
+    h, w = img.shape
+    s1 = 0
+    s2 = 0
+    for y in range(h):
+        yu = y - 1 if y > 0 else 1
+        yd = y + 1 if y < h - 1 else h - 2
+        for x in range(w):
+            xl = x - 1 if x > 0 else 1
+            xr = x + 1 if x < w - 1 else w - 2
+            lap = (np.int64(img[yu, x]) + np.int64(img[yd, x]) + np.int64(img[y, xl])
+                   + np.int64(img[y, xr]) - 4 * np.int64(img[y, x]))
+            s1 += lap
+            s2 += lap * lap
+    n = h * w
+    return (s2 - s1 * s1 / n) / n
+
+def _laplacian_var_cv(img: np.ndarray) -> float:
+    # |L| <= 1020 fits int16: same variance as CV_64F, 1/4 of the buffer
+    _, std = cv2.meanStdDev(cv2.Laplacian(img, cv2.CV_16S))
+    return float(std[0, 0]) ** 2
+
+laplacian_var = njit(cache=True)(_laplacian_var_fused) if njit else _laplacian_var_cv
+
 def extract_and_resize(frame_bgr: np.ndarray, bbox: tuple[int, int, int, int],
-                       size: tuple[int, int] = (64, 32)) -> np.ndarray:
-    """Extract bbox region, convert to grayscale float [0,1], resize to (w, h)."""
+                       size: tuple[int, int] = (CROP_W, CROP_H)) -> tuple[np.ndarray, np.ndarray]:
+    """Extract bbox region, convert to grayscale and resize to (w, h).
+
+    Returns (gray_u8, gray_f32): the uint8 crop feeds the Laplacian as is,
+    the same pixels scaled to [0,1] feed the CNN.
+    """
     x, y, w, h = bbox
-    crop = frame_bgr[y:y+h, x:x+w]
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY).astype(np.float32) / 255.0
-    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(frame_bgr[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
+    gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return gray, gray * np.float32(1 / 255.0)
 
-def score_sharpness(frame_bgr: np.ndarray, bbox: tuple[int, int, int, int],
-                    model: SharpnessNet) -> float:
-    """Hybrid sharpness score: 70% Laplacian variance + 30% CNN."""
-    crop = extract_and_resize(frame_bgr, bbox, (64, 32))
+def fuse_scores(lap_norm, cnn):
+    """Hybrid sharpness: 70% normalised Laplacian variance + 30% CNN.
 
-    # Laplacian variance
-    lap = cv2.Laplacian((crop * 255).astype(np.uint8), cv2.CV_64F).var()
-    lap_norm = min(lap / 500.0, 1.0)
+    Works elementwise on scalars or arrays.
+    """
+    return 0.7 * lap_norm + 0.3 * cnn
 
-    # CNN score
-    inp = Tensor(crop.reshape(1, 1, 32, 64))
-    cnn = model(inp).item()
+def lap_score(gray: np.ndarray) -> float:
+    """Laplacian variance of a uint8 crop, normalised and capped at 1."""
+    return min(laplacian_var(gray) / 500.0, 1.0)  # 500 calibrated on 64x32 crops; recheck if CROP_* changes
 
-    return 0.7 * lap_norm + 0.3 * cnn
+def score_sharpness(frame_bgr: np.ndarray, bbox: tuple[int, int, int, int],
+                    model: Scorer) -> float:
+    """Hybrid sharpness score: 70% Laplacian variance + 30% CNN."""
+    gray, crop = extract_and_resize(frame_bgr, bbox)
+    cnn = model(crop.reshape(1, 1, CROP_H, CROP_W))[0]
+    return fuse_scores(lap_score(gray), cnn)
+
+@dataclass
+class SweepResult:
+    """Scores for a focus sweep, one array slot per position."""
+    positions: np.ndarray  # int32[N]
+    lap: np.ndarray        # float32[N], Laplacian variance / 500, capped at 1
+    cnn: np.ndarray        # float32[N]
+    hybrid: np.ndarray     # float32[N], fuse_scores(lap, cnn)
+
+    @classmethod
+    def empty(cls, positions: list[int]) -> "SweepResult":
+        n = len(positions)
+        return cls(np.asarray(positions, dtype=np.int32), np.empty(n, np.float32),
+                   np.empty(n, np.float32), np.empty(n, np.float32))
+
+    def __add__(self, other: "SweepResult") -> "SweepResult":
+        return SweepResult(*(np.concatenate((a, b)) for a, b in
+                             zip((self.positions, self.lap, self.cnn, self.hybrid),
+                                 (other.positions, other.lap, other.cnn, other.hybrid))))
+
+    def head(self, n: int) -> "SweepResult":
+        return SweepResult(self.positions[:n], self.lap[:n], self.cnn[:n], self.hybrid[:n])
+
+    def best(self) -> tuple[int, float]:
+        i = int(self.hybrid.argmax())
+        return int(self.positions[i]), float(self.hybrid[i])
 
 # ---------------------------------------------------------------------------
 # Autofocus sweep
@@ -273,28 +577,101 @@ def score_sharpness(frame_bgr: np.ndarray, bbox: tuple[int, int, int, int],
 
 COARSE_POSITIONS = [0, 10, 20, 30, 45, 60, 80]
 
-def sweep_positions(cap: cv2.VideoCapture, positions: list[int], model: SharpnessNet,
-                    bbox: tuple[int, int, int, int] | None = None) -> list[tuple[int, float]]:
-    """Sweep focus positions and return (position, score) pairs."""
-    results = []
-    for pos in positions:
-        set_focus(pos)
-        time.sleep(SETTLE_MS / 1000.0)
-        frame = capture_frame(cap)
+def parabolic_peak(xs, ys) -> float | None:
+    """Vertex x of the parabola through three (x, y) points (any spacing).
+
+    Returns None unless the points bracket a maximum (concave parabola).
+    """
+    (x0, x1, x2), (y0, y1, y2) = map(float, xs), map(float, ys)
+    num = (x1 - x0) ** 2 * (y1 - y2) - (x1 - x2) ** 2 * (y1 - y0)
+    den = (x1 - x0) * (y1 - y2) - (x1 - x2) * (y1 - y0)
+    if den <= 0:
+        return None
+    return x1 - 0.5 * num / den
+
+def sweep_reduce(bbox: tuple[int, int, int, int]) -> tuple[int, tuple[int, int, int, int]]:
+    """Decode reduction for scoring bbox, and bbox in the reduced frame.
+
+    Scoring only keeps a CROP_W x CROP_H crop, so frames are decoded at half
+    size whenever the bbox still spans at least twice the crop there (the
+    final INTER_AREA resize then still averages). Smaller boxes keep full
+    resolution so their Laplacian scores stay comparable.
+    """
+    x, y, w, h = bbox
+    if w >= 4 * CROP_W and h >= 4 * CROP_H:
+        return 2, (x // 2, y // 2, w // 2, h // 2)
+    return 1, bbox
+
+def _move_and_settle(pos: int):
+    set_focus(pos)
+    time.sleep(SETTLE_MS / 1000.0)
 
+def iter_focus_frames(cap: cv2.VideoCapture, positions: list[int], reduce: int = 1):
+    """Yield (position, frame) for each focus position in order.
+
+    As soon as a frame is captured the lens is sent to the next position on
+    a worker thread, so its settle time overlaps the caller scoring the
+    frame: each step costs ~max(settle, score) instead of settle + score.
+    Frames are decoded at 1/reduce size (see capture_frame).
+    """
+    if not positions:
+        return
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        pending = ex.submit(_move_and_settle, positions[0])
+        for i, pos in enumerate(positions):
+            pending.result()
+            frame = capture_frame(cap, reduce)
+            if i + 1 < len(positions):
+                pending = ex.submit(_move_and_settle, positions[i + 1])
+            yield pos, frame
+
+def sweep_positions(cap: cv2.VideoCapture, positions: list[int], model: Scorer,
+                    bbox: tuple[int, int, int, int] | None = None,
+                    bar_width: int = 0, stop_after_drops: int = 0) -> SweepResult:
+    """Sweep focus positions and return their scores.
+
+    Laplacian scores are taken per frame; the crops are stacked and the CNN
+    scores them all in one batched call after the last capture. With a
+    fixed bbox, frames are decoded only as large as sweep_reduce() allows.
+    With bar_width > 0 each line also gets a '#' bar of score * bar_width.
+    With stop_after_drops > 0 the sweep ends once the Laplacian score has
+    fallen that many times in a row: on a unimodal focus curve nothing
+    further out can win. The result then covers only the positions visited.
+    """
+    res = SweepResult.empty(positions)
+    crops = np.empty((len(positions), 1, CROP_H, CROP_W), dtype=np.float32)
+    n, drops = len(positions), 0
+    reduce, roi = sweep_reduce(bbox) if bbox is not None else (1, None)
+    for i, (pos, frame) in enumerate(iter_focus_frames(cap, positions, reduce)):
         if bbox is None:
             detected = find_oled(frame)
             roi = detected if detected else center_crop(frame)
+
+        gray, crops[i, 0] = extract_and_resize(frame, roi)
+        res.lap[i] = lap_score(gray)
+        drops = drops + 1 if i and res.lap[i] < res.lap[i - 1] else 0
+        if stop_after_drops and drops >= stop_after_drops and i + 1 < n:
+            print(f"  (stopping after focus={pos}: score fell {drops}x in a row)")
+            n = i + 1
+            res, crops = res.head(n), crops[:n]
+            break
+    res.cnn[:] = model(crops)
+    res.hybrid[:] = fuse_scores(res.lap, res.cnn)
+
+    for pos, score in zip(res.positions, res.hybrid):
+        if bar_width:
+            print(f"  {pos:3d}    {score:.4f}  {'#' * int(score * bar_width)}")
         else:
-            roi = bbox
+            print(f"  focus={pos:3d}  score={score:.4f}")
+    return res
 
-        score = score_sharpness(frame, roi, model)
-        results.append((pos, score))
-        print(f"  focus={pos:3d}  score={score:.4f}")
-    return results
+def autofocus(cap: cv2.VideoCapture, model: Scorer, verify: bool = False) -> int:
+    """Run coarse→fine autofocus and return best focus value.
 
-def autofocus(cap: cv2.VideoCapture, model: SharpnessNet) -> int:
-    """Run coarse→fine autofocus and return best focus value."""
+    Every position is scored at most once per run (the bbox is fixed after
+    detection). The winner's score is reused from the sweep unless verify
+    is set, which re-captures it.
+    """
     # Disable autofocus
     set_ctrl("focus_automatic_continuous", 0)
     time.sleep(0.1)
@@ -313,39 +690,49 @@ def autofocus(cap: cv2.VideoCapture, model: SharpnessNet) -> int:
 
     # Phase 1: Coarse sweep
     print("\n--- Coarse sweep ---")
-    coarse = sweep_positions(cap, COARSE_POSITIONS, model, bbox)
-    best_pos, best_score = max(coarse, key=lambda x: x[1])
+    scores = sweep_positions(cap, COARSE_POSITIONS, model, bbox, stop_after_drops=2)
+    best_pos, best_score = scores.best()
     print(f"  coarse best: focus={best_pos} score={best_score:.4f}")
 
-    # Phase 2: Fine sweep around best
-    fine_lo = max(FOCUS_MIN, best_pos - 10)
-    fine_hi = min(FOCUS_MAX, best_pos + 10)
-    fine_positions = list(range(fine_lo, fine_hi + 1, FOCUS_STEP))
-    # Remove duplicates from coarse
-    fine_positions = [p for p in fine_positions if p not in dict(coarse)]
+    # Phase 2: Fit a parabola through the winner and its coarse neighbours
+    # and score only its vertex (snapped to FOCUS_STEP). A winner at either
+    # end of the coarse range has no bracket, so scan ±10 around it instead.
+    i = int(scores.hybrid.argmax())
+    peak = None
+    if 0 < i < len(scores.positions) - 1:
+        peak = parabolic_peak(scores.positions[i - 1:i + 2], scores.hybrid[i - 1:i + 2])
+    if peak is not None:
+        print(f"\n  parabola vertex: focus={peak:.1f}")
+        candidates = [int(round(peak / FOCUS_STEP)) * FOCUS_STEP]
+    else:
+        candidates = range(max(FOCUS_MIN, best_pos - 10), min(FOCUS_MAX, best_pos + 10) + 1,
+                           FOCUS_STEP)
+    # Skip positions already scored in the coarse pass
+    fine_positions = [p for p in candidates if p not in scores.positions]
 
     if fine_positions:
         print("\n--- Fine sweep ---")
-        fine = sweep_positions(cap, fine_positions, model, bbox)
-        all_results = coarse + fine
-    else:
-        all_results = coarse
+        scores += sweep_positions(cap, fine_positions, model, bbox)
 
-    best_pos, best_score = max(all_results, key=lambda x: x[1])
+    best_pos, best_score = scores.best()
 
     # Phase 3: Verify
     print("\n--- Verify ---")
     set_focus(best_pos)
-    time.sleep(SETTLE_MS / 1000.0)
-    frame = capture_frame(cap)
-    verify_score = score_sharpness(frame, bbox, model)
-    print(f"  verify: focus={best_pos} score={verify_score:.4f}")
+    if verify:
+        time.sleep(SETTLE_MS / 1000.0)
+        reduce, roi = sweep_reduce(bbox)  # score it the way the sweep did
+        verify_score = score_sharpness(capture_frame(cap, reduce), roi, model)
+        print(f"  verify: focus={best_pos} score={verify_score:.4f}")
+    else:
+        verify_score = best_score
+        print(f"  verify: focus={best_pos} score={verify_score:.4f} (cached)")
 
     set_focus(best_pos)
     print(f"\nAutofocus complete: focus={best_pos} (score={verify_score:.4f})")
     return best_pos
 
-def full_sweep(cap: cv2.VideoCapture, model: SharpnessNet):
+def full_sweep(cap: cv2.VideoCapture, model: Scorer):
     """Diagnostic: sweep all 51 focus levels."""
     set_ctrl("focus_automatic_continuous", 0)
     time.sleep(0.1)
@@ -368,17 +755,9 @@ def full_sweep(cap: cv2.VideoCapture, model: SharpnessNet):
     print(f"\n{'Focus':>5}  {'Score':>8}  {'Bar'}")
     print("-" * 50)
 
-    results = []
-    for pos in positions:
-        set_focus(pos)
-        time.sleep(SETTLE_MS / 1000.0)
-        frame = capture_frame(cap)
-        score = score_sharpness(frame, bbox, model)
-        results.append((pos, score))
-        bar = "#" * int(score * 40)
-        print(f"  {pos:3d}    {score:.4f}  {bar}")
+    results = sweep_positions(cap, positions, model, bbox, bar_width=40)
 
-    best_pos, best_score = max(results, key=lambda x: x[1])
+    best_pos, best_score = results.best()
     print(f"\nBest: focus={best_pos} score={best_score:.4f}")
 
     # Set to best
@@ -389,6 +768,16 @@ def full_sweep(cap: cv2.VideoCapture, model: SharpnessNet):
 # CLI
 # ---------------------------------------------------------------------------
 
+def _cli_model_path() -> Path:
+    """MODEL_PATH, or the lossy int8 copy when --int8 is given (exits if it's missing)."""
+    if "--int8" not in sys.argv[2:]:
+        return MODEL_PATH
+    if not QMODEL_PATH.exists():
+        print(f"Quantized model not found at {QMODEL_PATH}")
+        print("Run 'python autofocus.py quantize' first")
+        sys.exit(1)
+    return QMODEL_PATH
+
 def main():
     if len(sys.argv) < 2:
         print(__doc__)
@@ -398,15 +787,21 @@ def main():
 
     if cmd == "train":
         train()
+    elif cmd == "quantize":
+        if not MODEL_PATH.exists():
+            print(f"Model not found at {MODEL_PATH}")
+            print("Run 'python autofocus.py train' first")
+            sys.exit(1)
+        quantize_model()
     elif cmd == "focus":
         if not MODEL_PATH.exists():
             print(f"Model not found at {MODEL_PATH}")
             print("Run 'python autofocus.py train' first")
             sys.exit(1)
-        model = load_model()
+        model = jit_scorer(load_model(_cli_model_path()))
         cap = open_camera()
         try:
-            autofocus(cap, model)
+            autofocus(cap, model, verify="--verify" in sys.argv[2:])
         finally:
             cap.release()
     elif cmd == "sweep":
@@ -414,7 +809,7 @@ def main():
             print(f"Model not found at {MODEL_PATH}")
             print("Run 'python autofocus.py train' first")
             sys.exit(1)
-        model = load_model()
+        model = jit_scorer(load_model(_cli_model_path()))
         cap = open_camera()
         try:
             full_sweep(cap, model)
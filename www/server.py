@@ -3,6 +3,7 @@
 
 import http.server
 import os
+from email.utils import formatdate
 
 PORT = 8080
 WWW_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -16,20 +17,32 @@ class Handler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         if self.path.startswith("/snapshot.jpg"):
             try:
-                with open(SNAPSHOT_PATH, "rb") as f:
-                    data = f.read()
+                f = open(SNAPSHOT_PATH, "rb")
+            except FileNotFoundError:
+                self.send_error(404, "No snapshot yet")
+                return
+            with f:
+                st = os.fstat(f.fileno())
+                etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+                if etag in self.headers.get("If-None-Match", ""):
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    return
                 self.send_response(200)
                 self.send_header("Content-Type", "image/jpeg")
-                self.send_header("Content-Length", len(data))
+                self.send_header("Content-Length", st.st_size)
+                self.send_header("Last-Modified", formatdate(st.st_mtime, usegmt=True))
+                self.send_header("ETag", etag)
                 self.send_header("Cache-Control", "no-cache")
                 self.end_headers()
-                self.wfile.write(data)
-            except FileNotFoundError:
-                self.send_error(404, "No snapshot yet")
+                # Kernel copies file -> socket; the JPEG never enters Python
+                self.connection.sendfile(f, 0, st.st_size)
         else:
             super().do_GET()
 
 
 if __name__ == "__main__":
     print(f"Serving on http://0.0.0.0:{PORT}")
-    http.server.HTTPServer(("0.0.0.0", PORT), Handler).serve_forever()
+    http.server.ThreadingHTTPServer(("0.0.0.0", PORT), Handler).serve_forever()